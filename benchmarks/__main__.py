@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+from benchmarks.headless import create_context, select_platform, setup_view
+
+# Reference results, recorded on Mesa llvmpipe through EGL
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def measure(run, repeat: int, min_time: float) -> dict:
+    """
+    Times `run` like timeit: calls are batched until a batch takes at
+    least min_time, then `repeat` batches are timed. Reports microseconds
+    per call.
+    """
+    timer = timeit.Timer(run)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    times = [t / number * 1e6 for t in timer.repeat(repeat, number)]
+    return {
+        'median_us': statistics.median(times),
+        'min_us': min(times),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Prints every benchmark next to its baseline and returns the names of
+    those whose median got slower than the baseline by more than
+    `threshold` (0.2 is 20%).
+    """
+    failures = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f'{name:<40} {result["median_us"]:12.2f} us   (new)')
+            continue
+        ratio = result['median_us'] / reference['median_us']
+        slower = ratio > 1 + threshold
+        if slower:
+            failures.append(name)
+        print(
+            f'{name:<40} {result["median_us"]:12.2f} us   '
+            f'{ratio:6.2f}x{"   SLOWER" if slower else ""}'
+        )
+    return failures
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time the simulation and rendering hot paths.',
+    )
+    parser.add_argument(
+        '--gl',
+        choices=['egl', 'osmesa', 'none'],
+        default='egl',
+        help='offscreen GL backend for the rendering benchmarks',
+    )
+    parser.add_argument(
+        '-k',
+        dest='filter',
+        default='',
+        help='only run benchmarks whose name contains this',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=0.2,
+        help='seconds each timed batch should take at least',
+    )
+    parser.add_argument(
+        '--output', help='write the results as JSON to this file'
+    )
+    parser.add_argument(
+        '--baseline',
+        default=BASELINE,
+        help=(
+            'compare against results saved with --output, by default the '
+            'committed benchmarks/baseline.json; an empty string skips it'
+        ),
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='fail if a median is this much slower than the baseline',
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    select_platform(args.gl)
+
+    # Only now can anything import OpenGL
+    from benchmarks.cases import BENCHMARKS  # noqa: PLC0415
+
+    renderer = None
+    if args.gl != 'none':
+        from OpenGL.GL import GL_RENDERER, glGetString  # noqa: PLC0415
+
+        # Kept alive until the benchmarks are done
+        _context = create_context(args.gl)
+        setup_view()
+        renderer = glGetString(GL_RENDERER).decode()
+
+    results = {}
+    for case in BENCHMARKS:
+        if args.filter not in case.name:
+            continue
+        if case.gl and renderer is None:
+            print(f'{case.name:<40} skipped, no GL backend')
+            continue
+        results[case.name] = measure(case.setup(), args.repeat, args.min_time)
+        if not args.baseline:
+            print(
+                f'{case.name:<40} {results[case.name]["median_us"]:12.2f} us'
+            )
+
+    report = {
+        'python': sys.version.split()[0],
+        'machine': platform.machine(),
+        'gl_renderer': renderer,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['gl_renderer'] != renderer:
+            print(
+                f'baseline was recorded on {baseline["gl_renderer"]}, '
+                f'not {renderer}; GL timings will not compare'
+            )
+        failures = compare(results, baseline['results'], args.threshold)
+        if failures:
+            print(f'{len(failures)} benchmark(s) regressed: {failures}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
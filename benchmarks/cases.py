@@ -0,0 +1,196 @@
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from soccer.ball import Ball
+from soccer.bresenham import (
+    bresenham_circle,
+    bresenham_circle_points,
+    bresenham_line,
+    bresenham_line_points,
+)
+from soccer.collision import BoundingBox, CollisionSystem
+from soccer.field import Field
+from soccer.players import PlayerRenderer, PlayerSwarm, get_n_players
+from soccer.simulation import DEFAULT_FORMATION, Simulation
+
+SEED = 1234
+PLAYER_SIZE = 14.0
+# Number of queries one timed call runs, to average out the spread of
+# where the boxes land
+QUERIES = 256
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # Builds the state and returns the function that is timed
+    setup: Callable[[], Callable[[], None]]
+    gl: bool = False
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, gl: bool = False):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, gl))
+        return setup
+
+    return register
+
+
+def _random_positions(rng: np.random.Generator, n: int) -> np.ndarray:
+    # Spread over a size factor 6 field
+    return rng.uniform([-270, -420], [270, 420], size=(n, 2))
+
+
+def _random_boxes(rng: np.random.Generator, n: int) -> list[BoundingBox]:
+    return [
+        BoundingBox(x - 10, y - 10, x + 10, y + 10)
+        for x, y in _random_positions(rng, n).tolist()
+    ]
+
+
+@benchmark('bresenham_line_points')
+def _line_points():
+    return lambda: bresenham_line_points((-270, -420), (270, 420))
+
+
+@benchmark('bresenham_circle_points')
+def _circle_points():
+    return lambda: bresenham_circle_points((0, 0), 150)
+
+
+@benchmark('bresenham_line', gl=True)
+def _line():
+    return lambda: bresenham_line((-270, -420), (270, 420))
+
+
+@benchmark('bresenham_circle', gl=True)
+def _circle():
+    return lambda: bresenham_circle((0, 0), 150)
+
+
+@benchmark(f'field_check_collision_x{QUERIES}')
+def _field_check_collision():
+    field = Field(size_factor=6, texture_path=None)
+    boxes = _random_boxes(np.random.default_rng(SEED), QUERIES)
+
+    def run():
+        for bb in boxes:
+            field.check_collision(bb)
+
+    return run
+
+
+def _collision_system(n_players: int):
+    def setup():
+        rng = np.random.default_rng(SEED)
+        system = CollisionSystem(
+            cell_size=Simulation.PLAYERS_PER_CELL * PLAYER_SIZE
+        )
+        system.add_collidable(Field(size_factor=6, texture_path=None))
+        positions = _random_positions(rng, n_players).tolist()
+        for player in get_n_players(positions, size=PLAYER_SIZE):
+            system.add_collidable(player, indexed=True)
+        boxes = _random_boxes(rng, QUERIES)
+
+        def run():
+            for bb in boxes:
+                system.check_collisions(bb)
+
+        return run
+
+    return setup
+
+
+for _n in (8, 64, 512):
+    benchmark(f'check_collisions_{_n}_players_x{QUERIES}')(
+        _collision_system(_n)
+    )
+
+
+def _player_update(n_players: int):
+    def setup():
+        random.seed(SEED)
+        positions = _random_positions(np.random.default_rng(SEED), n_players)
+        players = get_n_players(positions.tolist(), size=PLAYER_SIZE)
+
+        def run():
+            for player in players:
+                player.update(30.0, -40.0)
+
+        return run
+
+    return setup
+
+
+def _swarm_update(n_players: int):
+    def setup():
+        positions = _random_positions(np.random.default_rng(SEED), n_players)
+        swarm = PlayerSwarm(positions, size=PLAYER_SIZE, seed=SEED)
+        return lambda: swarm.update(30.0, -40.0)
+
+    return setup
+
+
+for _n in (8, 512, 4096):
+    benchmark(f'player_update_{_n}')(_player_update(_n))
+    benchmark(f'swarm_update_{_n}')(_swarm_update(_n))
+
+
+def _frame(cached: bool):
+    def setup():
+        from OpenGL.GL import GL_COLOR_BUFFER_BIT, glClear, glFinish  # noqa: PLC0415
+
+        random.seed(SEED)
+        field = Field(size_factor=6)
+        ball = Ball(field=field, verbose=False)
+        players = get_n_players(DEFAULT_FORMATION, size=PLAYER_SIZE)
+        renderer = PlayerRenderer()
+
+        # Text needs glutInit, which needs a display, so the frame is
+        # everything but the score, button and overlays
+        def run():
+            if not cached:
+                field.layer.invalidate()
+            glClear(GL_COLOR_BUFFER_BIT)
+            field.draw()
+            ball.draw()
+            renderer.draw(players)
+            glFinish()
+
+        return run
+
+    return setup
+
+
+benchmark('frame', gl=True)(_frame(cached=True))
+benchmark('frame_field_redrawn', gl=True)(_frame(cached=False))
+
+
+@benchmark('frame_queued', gl=True)
+def _frame_queued():
+    from OpenGL.GL import glFinish  # noqa: PLC0415
+
+    from soccer.renderer import LegacyRenderer  # noqa: PLC0415
+
+    random.seed(SEED)
+    field = Field(size_factor=6)
+    ball = Ball(field=field, verbose=False)
+    players = get_n_players(DEFAULT_FORMATION, size=PLAYER_SIZE)
+    renderer = LegacyRenderer()
+
+    # The same frame as above, drawn through the render queue
+    def run():
+        renderer.begin_frame()
+        renderer.draw_field(field)
+        renderer.draw_ball(ball)
+        renderer.draw_players(players)
+        renderer.end_frame()
+        glFinish()
+
+    return run
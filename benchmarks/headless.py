@@ -0,0 +1,117 @@
+import ctypes
+import os
+
+WIDTH = 1000
+HEIGHT = 800
+
+
+def select_platform(backend: str):
+    """
+    Points PyOpenGL at the offscreen backend. Must run before anything
+    imports OpenGL, since PyOpenGL picks its platform on first import.
+    """
+    if backend == 'egl':
+        os.environ['PYOPENGL_PLATFORM'] = 'egl'
+        # Mesa can render without any display server
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+    elif backend == 'osmesa':
+        os.environ['PYOPENGL_PLATFORM'] = 'osmesa'
+
+
+def create_context(backend: str, width: int = WIDTH, height: int = HEIGHT):
+    """
+    Makes a compatibility profile GL context current, rendering to an
+    offscreen surface of the game window's size. Both backends run on
+    Mesa's llvmpipe on machines without a GPU. Returns whatever has to
+    be kept alive for the context to stay valid.
+    """
+    if backend == 'egl':
+        return _create_egl_context(width, height)
+    if backend == 'osmesa':
+        return _create_osmesa_context(width, height)
+    raise ValueError(f'unknown GL backend {backend!r}')
+
+
+def _create_egl_context(width: int, height: int):
+    from OpenGL import EGL  # noqa: PLC0415
+
+    display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+    major, minor = EGL.EGLint(), EGL.EGLint()
+    if not EGL.eglInitialize(
+        display, ctypes.pointer(major), ctypes.pointer(minor)
+    ):
+        raise RuntimeError('could not initialize EGL')
+
+    attributes = [
+        EGL.EGL_SURFACE_TYPE,
+        EGL.EGL_PBUFFER_BIT,
+        EGL.EGL_RED_SIZE,
+        8,
+        EGL.EGL_GREEN_SIZE,
+        8,
+        EGL.EGL_BLUE_SIZE,
+        8,
+        EGL.EGL_ALPHA_SIZE,
+        8,
+        EGL.EGL_RENDERABLE_TYPE,
+        EGL.EGL_OPENGL_BIT,
+        EGL.EGL_NONE,
+    ]
+    config = EGL.EGLConfig()
+    n_configs = EGL.EGLint()
+    if (
+        not EGL.eglChooseConfig(
+            display,
+            (EGL.EGLint * len(attributes))(*attributes),
+            ctypes.pointer(config),
+            1,
+            ctypes.pointer(n_configs),
+        )
+        or not n_configs.value
+    ):
+        raise RuntimeError('no EGL config for desktop OpenGL')
+
+    size = [EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE]
+    surface = EGL.eglCreatePbufferSurface(
+        display, config, (EGL.EGLint * len(size))(*size)
+    )
+    EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+    context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+    if not EGL.eglMakeCurrent(display, surface, surface, context):
+        raise RuntimeError('could not make the EGL context current')
+    return display, surface, context
+
+
+def _create_osmesa_context(width: int, height: int):
+    from OpenGL import GL, arrays, osmesa  # noqa: PLC0415
+
+    context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+    if not context:
+        raise RuntimeError('could not create an OSMesa context')
+    buffer = arrays.GLubyteArray.zeros((height, width, 4))
+    if not osmesa.OSMesaMakeCurrent(
+        context, buffer, GL.GL_UNSIGNED_BYTE, width, height
+    ):
+        raise RuntimeError('could not make the OSMesa context current')
+    return context, buffer
+
+
+def setup_view(width: int = WIDTH, height: int = HEIGHT):
+    """
+    Same projection as Game, so frames cover the same pixels.
+    """
+    from OpenGL.GL import (  # noqa: PLC0415
+        GL_MODELVIEW,
+        GL_PROJECTION,
+        glLoadIdentity,
+        glMatrixMode,
+        glOrtho,
+        glViewport,
+    )
+
+    glViewport(0, 0, width, height)
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(-500, 500, -400, 400, -1000, 1000)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
@@ -1,8 +1,59 @@
+import argparse
+
+from soccer import tracing
 from soccer.game import Game
+from soccer.renderer import RENDERERS
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Futebol')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument(
+        '--record',
+        metavar='PATH',
+        help='save the input of the match to PATH so it can be replayed',
+    )
+    parser.add_argument(
+        '--trace',
+        metavar='PATH',
+        help='write a Chrome trace of every frame to PATH (open in Perfetto)',
+    )
+    parser.add_argument(
+        '--gl-stats',
+        action='store_true',
+        help='count GL calls per subsystem, shown in the F3 HUD',
+    )
+    parser.add_argument(
+        '--renderer',
+        choices=RENDERERS,
+        default='legacy',
+        help='fixed-function (legacy) or core profile shader renderer',
+    )
+    parser.add_argument(
+        '--startup-report',
+        action='store_true',
+        help='print how long each startup stage took',
+    )
+    parser.add_argument(
+        '--threaded',
+        action='store_true',
+        help='run the simulation on its own thread, overlapping drawing',
+    )
+    return parser.parse_args()
 
 
 def main():
-    game = Game()
+    args = parse_args()
+    if args.trace:
+        tracing.start(args.trace)
+    game = Game(
+        seed=args.seed,
+        record_path=args.record,
+        gl_stats=args.gl_stats,
+        renderer=args.renderer,
+        startup_report=args.startup_report,
+        threaded=args.threaded,
+    )
     game.run()
 
 
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing import Pool
+
+from soccer.collision import Collision
+from soccer.replay import InputLog, replay
+from soccer.simulation import DEFAULT_FORMATION, RandomController, Simulation
+from soccer.statelog import StateRecorder
+
+CORNERS = (
+    Collision.CORNER_A_LEFT,
+    Collision.CORNER_A_RIGHT,
+    Collision.CORNER_B_LEFT,
+    Collision.CORNER_B_RIGHT,
+)
+LATERALS = (Collision.LATERAL_LEFT, Collision.LATERAL_RIGHT)
+
+
+@dataclass
+class MatchConfig:
+    ticks: int
+    size_factor: int
+    formation: list[tuple[float, float]]
+    player_size: float
+    vectorized: bool
+    state_log: str | None = None
+
+
+@dataclass
+class MatchResult:
+    seed: int
+    goals_a: int
+    goals_b: int
+    corners: int
+    laterals: int
+    blocks: int
+
+
+@dataclass
+class Summary:
+    matches: int = 0
+    goals_a: int = 0
+    goals_b: int = 0
+    corners: int = 0
+    laterals: int = 0
+    blocks: int = 0
+
+    def add(self, result: MatchResult):
+        self.matches += 1
+        self.goals_a += result.goals_a
+        self.goals_b += result.goals_b
+        self.corners += result.corners
+        self.laterals += result.laterals
+        self.blocks += result.blocks
+
+
+def run_match(seed: int, config: MatchConfig) -> MatchResult:
+    simulation = Simulation(
+        size_factor=config.size_factor,
+        formation=config.formation,
+        player_size=config.player_size,
+        seed=seed,
+        vectorized=config.vectorized,
+    )
+    if config.state_log:
+        simulation.state_recorder = StateRecorder.for_simulation(
+            os.path.join(config.state_log, f'seed-{seed}'),
+            simulation,
+            capacity=config.ticks,
+        )
+    simulation.run(config.ticks, RandomController(seed))
+    if simulation.state_recorder:
+        simulation.state_recorder.close()
+
+    events = simulation.events
+    return MatchResult(
+        seed=seed,
+        goals_a=simulation.score.scoreA,
+        goals_b=simulation.score.scoreB,
+        corners=sum(events[c] for c in CORNERS),
+        laterals=sum(events[c] for c in LATERALS),
+        blocks=events[Collision.PLAYER],
+    )
+
+
+def replay_match(path: str) -> dict:
+    log = InputLog.load(path)
+    start = time.perf_counter()
+    simulation = replay(log)
+    return {
+        'path': path,
+        'seed': log.seed,
+        'ticks': log.ticks,
+        'goals_a': simulation.score.scoreA,
+        'goals_b': simulation.score.scoreB,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _run_match(args: tuple[int, MatchConfig]) -> MatchResult:
+    return run_match(*args)
+
+
+def parse_position(value: str) -> tuple[float, float]:
+    try:
+        x, y = value.split(',')
+        return float(x), float(y)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f'expected a position as x,y, got {value!r}'
+        ) from None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Run many headless matches across all cores.'
+    )
+    parser.add_argument(
+        '--seeds',
+        type=int,
+        nargs=2,
+        default=(0, 100),
+        metavar=('START', 'STOP'),
+        help='run one match for every seed in range(START, STOP)',
+    )
+    parser.add_argument('--ticks', type=int, default=60 * 60 * 5)
+    parser.add_argument('--size-factor', type=int, default=6)
+    parser.add_argument('--player-size', type=float, default=14.0)
+    parser.add_argument(
+        '--formation',
+        type=parse_position,
+        nargs='+',
+        default=DEFAULT_FORMATION,
+        metavar='X,Y',
+        help='initial player positions',
+    )
+    parser.add_argument(
+        '--vectorized',
+        action='store_true',
+        help='use the PlayerSwarm engine for the players',
+    )
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument(
+        '--output',
+        help='also write one JSON line per match to this file',
+    )
+    parser.add_argument(
+        '--state-log',
+        metavar='DIR',
+        help='record every tick of each match to DIR/seed-N',
+    )
+    parser.add_argument(
+        '--replay',
+        nargs='+',
+        metavar='PATH',
+        help='instead, replay input logs saved with main.py --record',
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.replay:
+        for path in args.replay:
+            print(json.dumps(replay_match(path)))
+        return
+
+    config = MatchConfig(
+        ticks=args.ticks,
+        size_factor=args.size_factor,
+        formation=args.formation,
+        player_size=args.player_size,
+        vectorized=args.vectorized,
+        state_log=args.state_log,
+    )
+    jobs = ((seed, config) for seed in range(*args.seeds))
+
+    summary = Summary()
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        with Pool(args.workers) as pool:
+            # Results are merged as they arrive, nothing is kept per match
+            for result in pool.imap_unordered(_run_match, jobs, chunksize=4):
+                summary.add(result)
+                if output:
+                    output.write(json.dumps(asdict(result)) + '\n')
+    finally:
+        if output:
+            output.close()
+
+    print(json.dumps(asdict(summary), indent=2))
+
+
+if __name__ == '__main__':
+    main()
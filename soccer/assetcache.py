@@ -0,0 +1,63 @@
+import contextlib
+import hashlib
+import os
+import re
+
+# Bytes in a source_hash() digest
+DIGEST_SIZE = 16
+
+
+def source_hash(path: str, *salt) -> str:
+    """
+    Hash of the file at `path` plus anything else the cached data depends
+    on, such as a format version.
+    """
+    with open(path, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=DIGEST_SIZE)
+    digest.update(repr(salt).encode())
+    return digest.hexdigest()
+
+
+def entry_key(source: str) -> str:
+    """
+    What the entries of `source` are named after: its file name, for
+    whoever looks in the cache, and a hash of its full path, so files
+    with the same name in different directories have their own entries.
+    """
+    path = os.path.normcase(os.path.abspath(source))
+    digest = hashlib.blake2b(path.encode(), digest_size=8).hexdigest()
+    return f'{os.path.basename(source)}-{digest}'
+
+
+def entry_path(directory: str, source: str, digest: str, suffix: str) -> str:
+    return os.path.join(directory, f'{entry_key(source)}.{digest}{suffix}')
+
+
+@contextlib.contextmanager
+def atomic_write(path: str):
+    """
+    Opens a temporary file for writing that replaces `path` only once it
+    is complete, so a reader never maps a half-written file.
+    """
+    temporary = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as f:
+            yield f
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def remove_stale(directory: str, source: str, suffix: str):
+    """
+    Deletes every entry of `source` in `directory`, before a new one for
+    its current contents is written.
+    """
+    entry = re.compile(
+        rf'{re.escape(entry_key(source))}\.[0-9a-f]{{{2 * DIGEST_SIZE}}}'
+        rf'{re.escape(suffix)}'
+    )
+    for name in os.listdir(directory):
+        if entry.fullmatch(name):
+            os.remove(os.path.join(directory, name))
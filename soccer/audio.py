@@ -0,0 +1,149 @@
+import os
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+from soccer.assetcache import (
+    atomic_write,
+    entry_path,
+    remove_stale,
+    source_hash,
+)
+from soccer.tracing import span
+
+CACHE_DIR = '.cache/audio'
+SUFFIX = '.pcm'
+# Bumped whenever the file layout changes, so old files are never read
+FORMAT_VERSION = 1
+# Magic, format version, then the mixer format the samples are in:
+# frequency, sample size (negative if signed, as pygame reports it) and
+# channels
+HEADER = struct.Struct('<4sHIhH')
+MAGIC = b'CGPC'
+# Samples start here, past the header
+DATA_OFFSET = 64
+
+
+def write_pcm(path: str, pcm: bytes, mixer: tuple[int, int, int]):
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, *mixer))
+        f.seek(DATA_OFFSET)
+        f.write(pcm)
+
+
+def read_pcm(path: str, mixer: tuple[int, int, int]) -> np.ndarray:
+    """
+    Maps a file written by write_pcm and returns its samples as a
+    read-only byte view, checking they are in the `mixer` format.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, version, *format_ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or tuple(format_) != mixer:
+        raise ValueError(f'{path} does not hold {mixer} PCM samples')
+    return data[DATA_OFFSET:]
+
+
+class AudioCache:
+    """
+    Sounds decoded once to PCM in the mixer's format and kept in
+    `directory` as memory-mapped files, named after a hash of the source
+    file and the mixer format. Building a Sound from them is a copy
+    instead of an MP3 decode. Loads run on one background thread.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='audio'
+        )
+
+    def entry(self, path: str, mixer: tuple[int, int, int]) -> str:
+        digest = source_hash(path, FORMAT_VERSION, mixer)
+        return entry_path(self.directory, path, digest, SUFFIX)
+
+    def pcm(self, path: str) -> np.ndarray | bytes:
+        mixer = pygame.mixer.get_init()
+        entry = self.entry(path, mixer)
+        if os.path.exists(entry):
+            try:
+                return read_pcm(entry, mixer)
+            except ValueError:
+                pass
+
+        pcm = pygame.mixer.Sound(path).get_raw()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            remove_stale(self.directory, path, SUFFIX)
+            write_pcm(entry, pcm, mixer)
+        except OSError:
+            # A read-only checkout still plays, it just decodes every time
+            return pcm
+        return read_pcm(entry, mixer)
+
+    def load(self, path: str) -> pygame.mixer.Sound:
+        with span(f'audio {os.path.basename(path)}'):
+            return pygame.mixer.Sound(buffer=self.pcm(path))
+
+    def submit(self, path: str) -> Future:
+        return self.executor.submit(self.load, path)
+
+
+audio_cache = AudioCache()
+
+
+class Sound:
+    """
+    A sound loaded in the background through the audio cache. play()
+    never blocks: before the sound is loaded it only asks for it to be
+    played once it is, unless that happens more than `max_delay` seconds
+    after the request (None waits any time), since a late effect is
+    worse than a missing one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_delay: float | None = 0.5,
+        cache: AudioCache = audio_cache,
+    ):
+        self.path = path
+        self.max_delay = max_delay
+        self.cache = cache
+        self.sound: pygame.mixer.Sound | None = None
+        self.future: Future | None = None
+        self.requested: float | None = None
+        # Reentrant, as a done callback runs inline if the load finished
+        self.lock = threading.RLock()
+
+    @property
+    def ready(self) -> bool:
+        return self.sound is not None
+
+    def load_async(self):
+        with self.lock:
+            if self.future is None:
+                self.future = self.cache.submit(self.path)
+                self.future.add_done_callback(self._loaded)
+
+    def play(self):
+        with self.lock:
+            if self.sound is None:
+                self.requested = time.perf_counter()
+                self.load_async()
+                return
+        self.sound.play()
+
+    def _loaded(self, future: Future):
+        sound = future.result()
+        with self.lock:
+            self.sound = sound
+            requested, self.requested = self.requested, None
+        if requested is None:
+            return
+        late = time.perf_counter() - requested
+        if self.max_delay is None or late <= self.max_delay:
+            sound.play()
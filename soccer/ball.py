@@ -2,87 +2,107 @@ from typing import Callable
 
 import pygame
 from OpenGL.GL import (
-    GL_LINEAR,
-    GL_RGB,
     GL_TEXTURE_2D,
-    GL_TEXTURE_MAG_FILTER,
-    GL_TEXTURE_MIN_FILTER,
-    GL_UNSIGNED_BYTE,
+    GL_TRIANGLES,
     glBindTexture,
     glDisable,
     glEnable,
-    glGenTextures,
     glPopMatrix,
     glPushMatrix,
     glRotatef,
-    glTexImage2D,
-    glTexParameteri,
     glTranslatef,
 )
-from OpenGL.GLU import gluNewQuadric, gluQuadricTexture, gluSphere
 
 from soccer.collision import BoundingBox, Collision, CollisionSystem
 from soccer.field import Field
+from soccer.mesh import get_sphere
 from soccer.overlay import TextOverlay
+from soccer.render_queue import DrawItem, Layer, RenderQueue, rotation
 from soccer.score import Score
+from soccer.textures import texture_cache
+from soccer.tracing import traced
+
+BALL_TEXTURE = 'soccer/assets/ball.jpeg'
 
 
 class Ball:
     INITIAL_POSITION = [0.0, 0.0]
     SPEED = 3.0
+    # Sphere (slices, stacks) for each level of detail
+    LEVELS_OF_DETAIL = {
+        'high': (32, 16),
+        'medium': (16, 8),
+        'low': (8, 4),
+    }
 
     def __init__(
         self,
         field: Field,
         radius: float = 10,
-        texture_path: str = 'soccer/assets/ball.jpeg',
+        texture_path: str | None = BALL_TEXTURE,
+        verbose: bool = True,
+        lod: str = 'high',
     ):
         self.position = [*self.INITIAL_POSITION]
+        self.previous_position = [*self.INITIAL_POSITION]
         self.rot_angle = 0.0
         self.radius = radius
-        self.texture = self.load_texture(texture_path)
+        self.texture = (
+            self.load_texture(texture_path) if texture_path else None
+        )
         self.field = field
+        self.verbose = verbose
+        self.lod = lod
 
     @staticmethod
     def load_texture(texture_path):
-        texture_surface = pygame.image.load(texture_path)
-        texture_data = pygame.image.tostring(texture_surface, 'RGB', True)
-        width, height = texture_surface.get_size()
-
-        texture_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
-            GL_RGB,
-            width,
-            height,
-            0,
-            GL_RGB,
-            GL_UNSIGNED_BYTE,
-            texture_data,
-        )
-
-        return texture_id
-
-    def draw(self):
+        return texture_cache.load(texture_path)
+
+    @traced('Ball.draw')
+    def draw(self, alpha: float = 1.0):
+        """
+        Draws the ball `alpha` of the way from its previous position to the
+        current one.
+        """
+        (px, py), (x, y) = self.previous_position, self.position
         glPushMatrix()
 
-        glTranslatef(*self.position, 0.0)
+        glTranslatef(px + (x - px) * alpha, py + (y - py) * alpha, 0.0)
         glRotatef(self.rot_angle, 1.0, 1.0, 1.0)
 
         glEnable(GL_TEXTURE_2D)
         glBindTexture(GL_TEXTURE_2D, self.texture)
 
-        quadric = gluNewQuadric()
-        gluQuadricTexture(quadric, True)
-        gluSphere(quadric, self.radius, 32, 16)
+        slices, stacks = self.LEVELS_OF_DETAIL[self.lod]
+        get_sphere(self.radius, slices, stacks).draw()
 
         glDisable(GL_TEXTURE_2D)
         glPopMatrix()
 
+    def submit(self, queue: RenderQueue, alpha: float = 1.0):
+        """
+        Queues the same drawing as draw(), with the translation and
+        rotation applied to the vertices.
+        """
+        (px, py), (x, y) = self.previous_position, self.position
+        transform = rotation(self.rot_angle, (1.0, 1.0, 1.0))
+        transform[0, 3] = px + (x - px) * alpha
+        transform[1, 3] = py + (y - py) * alpha
+
+        slices, stacks = self.LEVELS_OF_DETAIL[self.lod]
+        mesh = get_sphere(self.radius, slices, stacks)
+        queue.submit(
+            DrawItem(
+                Layer.BALL,
+                GL_TRIANGLES,
+                mesh.vertices[:, :3],
+                texture=self.texture or 0,
+                texcoords=mesh.vertices[:, 6:8],
+                transform=transform,
+                indices=mesh.indices,
+            )
+        )
+
     def get_bouding_box(self, pos: tuple = None) -> tuple:
         if not pos:
             pos = self.position
@@ -94,6 +114,7 @@ class Ball:
             y_max=pos[1] + self.radius,
         )
 
+    @traced('Ball.update')
     def update(
         self,
         keys: pygame.key.ScancodeWrapper,
@@ -101,7 +122,7 @@ class Ball:
         score: Score,
         set_pause: Callable,
         overlay: TextOverlay,
-    ):
+    ) -> Collision | None:
         new_x, new_y = self.position
         if keys[pygame.K_LEFT]:
             new_x -= self.SPEED
@@ -117,7 +138,7 @@ class Ball:
             self.rot_angle -= 2
         if keys[pygame.K_e]:
             self.reset_position()
-            return
+            return None
 
         bb = self.get_bouding_box((new_x, new_y))
         collision = collision_system.check_collisions(bb)
@@ -125,18 +146,18 @@ class Ball:
             score.add_points('A')
             score.on_goal()
             self.position = [0.0, 0.0]
-            print('GOAL FROM A')
+            self._log('GOAL FROM A')
             set_pause(3)
         elif collision == Collision.GOAL_B:
             score.add_points('B')
             score.on_goal()
             self.position = [0.0, 0.0]
-            print('GOAL FROM B')
+            self._log('GOAL FROM B')
             set_pause(3)
         elif collision == Collision.NONE:
             self.position = [new_x, new_y]
         elif collision == Collision.PLAYER:
-            print('BLOCKED BY PLAYER!')
+            self._log('BLOCKED BY PLAYER!')
         elif collision == Collision.CORNER_A_LEFT:
             self.position = [-self.field.width / 2, self.field.length / 2]
             overlay.show_text('CORNER')
@@ -162,7 +183,16 @@ class Ball:
             self.position = [self.field.width / 2, new_y]
             set_pause(3, reset_players=False)
         else:
-            print('OUT!')
+            self._log('OUT!')
+
+        return collision
 
     def reset_position(self):
         self.position = [*self.INITIAL_POSITION]
+
+    def save_previous(self):
+        self.previous_position = self.position
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
@@ -0,0 +1,226 @@
+import numpy as np
+
+from soccer.ball import Ball
+from soccer.collision import Collision
+from soccer.field import Field
+from soccer.players import (
+    CHANGE_ROUTE_PATTERN_PROB,
+    DEFENSE_POSITION_X,
+    DEFENSE_POSITION_Y,
+    THRESHOLD_DISTANCE_FOR_DEFENSE,
+    PlayerSwarm,
+)
+from soccer.simulation import DEFAULT_FORMATION, Simulation
+
+# Columns of the (N, 5) key arrays consumed by BatchSimulation.step
+KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN, KEY_E = range(5)
+N_KEYS = 5
+
+N_CODES = max(c.value for c in Collision) + 1
+
+# Released, first key held or second key held, for a pair of opposite keys
+_AXIS_CHOICES = np.array([(False, False), (True, False), (False, True)])
+
+
+class BatchSimulation:
+    """
+    N independent matches advanced in lockstep. Every piece of state is an
+    (N, ...) array and step() applies the rules of Ball.update,
+    Player.update and Field.check_collision to all matches at once.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        n_matches: int,
+        *,
+        size_factor: int = 6,
+        formation: list[tuple[float, float]] = DEFAULT_FORMATION,
+        player_size: float = 14.0,
+        ball_radius: float = 10.0,
+        seed: int | None = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.n_matches = n_matches
+        self.field = Field(size_factor=size_factor, texture_path=None)
+        self.ball_radius = ball_radius
+        self.player_size = player_size
+
+        n_players = len(formation)
+        self.initial_players = np.array(formation, dtype=np.float64)
+        self.players = np.tile(self.initial_players, (n_matches, 1, 1))
+        self.spread = self._random_spread((n_matches, n_players, 2))
+        self.orientations = np.zeros((n_matches, n_players))
+
+        self.ball = np.tile(Ball.INITIAL_POSITION, (n_matches, 1)).astype(
+            np.float64
+        )
+        self.rot_angle = np.zeros(n_matches)
+        self.scores = np.zeros((n_matches, 2), dtype=np.int64)
+        self.pause = np.zeros(n_matches, dtype=np.int64)
+        self.events = np.zeros((n_matches, N_CODES), dtype=np.int64)
+        self.tick = 0
+
+        w, h = self.field.width / 2, self.field.length / 2
+        self.corners = {
+            Collision.CORNER_A_LEFT.value: (-w, h),
+            Collision.CORNER_A_RIGHT.value: (w, h),
+            Collision.CORNER_B_LEFT.value: (-w, -h),
+            Collision.CORNER_B_RIGHT.value: (w, -h),
+        }
+
+    def step(self, keys: np.ndarray | None = None):
+        self.tick += 1
+        if keys is None:
+            keys = np.zeros((self.n_matches, N_KEYS), dtype=bool)
+        keys = np.broadcast_to(keys, (self.n_matches, N_KEYS))
+
+        # Handle forced pause. No entity should move
+        paused = self.pause > 0
+        self.pause[paused] -= 1
+        active = ~paused
+
+        dx = (keys[:, KEY_RIGHT].astype(np.int64) - keys[:, KEY_LEFT]) * active
+        dy = (keys[:, KEY_UP].astype(np.int64) - keys[:, KEY_DOWN]) * active
+        self.rot_angle += 3 * dx + 2 * dy
+        new = self.ball + Ball.SPEED * np.stack([dx, dy], axis=1)
+
+        kicked_off = active & keys[:, KEY_E]
+        self.ball[kicked_off] = Ball.INITIAL_POSITION
+
+        moving = np.flatnonzero(active & ~keys[:, KEY_E])
+        codes = self.classify(new[moving], self.players[moving])
+        np.add.at(self.events, (moving, codes), 1)
+        self._resolve(moving, codes, new[moving])
+
+        self._update_players(active)
+
+    def run(self, ticks: int, controller=None):
+        for _ in range(ticks):
+            self.step(controller(self) if controller else None)
+
+    def classify(self, centers: np.ndarray, players: np.ndarray) -> np.ndarray:
+        """
+        Collision code for a ball centered at each row of `centers`, with
+        the same priority as CollisionSystem: field first, then players.
+        """
+        r = self.ball_radius
+        boxes = np.concatenate([centers - r, centers + r], axis=1)
+
+        codes = self.field.check_collisions_batch(boxes)
+
+        half = self.player_size // 2
+        player_hit = ~(
+            (boxes[:, None, 2] < players[..., 0] - half)
+            | (boxes[:, None, 0] > players[..., 0] + half)
+            | (boxes[:, None, 3] < players[..., 1] - half)
+            | (boxes[:, None, 1] > players[..., 1] + half)
+        ).all(axis=1)
+        blocked = (codes == Collision.NONE.value) & player_hit
+        codes[blocked] = Collision.PLAYER.value
+        return codes
+
+    def goals(self) -> np.ndarray:
+        return self.scores.copy()
+
+    def _resolve(self, idx: np.ndarray, codes: np.ndarray, new: np.ndarray):
+        pause_ticks = 3 * Simulation.TICK_RATE
+
+        free = codes == Collision.NONE.value
+        self.ball[idx[free]] = new[free]
+
+        for team, code in enumerate((Collision.GOAL_A, Collision.GOAL_B)):
+            scored = idx[codes == code.value]
+            self.scores[scored, team] += 1
+            self.ball[scored] = Ball.INITIAL_POSITION
+            self._pause(scored, pause_ticks, reset_players=True)
+
+        for code, corner in self.corners.items():
+            taken = idx[codes == code]
+            self.ball[taken] = corner
+            self._pause(taken, pause_ticks, reset_players=True)
+
+        for code, side in (
+            (Collision.LATERAL_LEFT, -1),
+            (Collision.LATERAL_RIGHT, 1),
+        ):
+            mask = codes == code.value
+            self.ball[idx[mask], 0] = side * self.field.width / 2
+            self.ball[idx[mask], 1] = new[mask, 1]
+            self._pause(idx[mask], pause_ticks, reset_players=False)
+
+    def _pause(self, idx: np.ndarray, ticks: int, reset_players: bool):
+        self.pause[idx] = ticks
+        if reset_players:
+            self.players[idx] = self.initial_players
+            self.orientations[idx] = 0.0
+
+    def _update_players(self, active: np.ndarray):
+        at_origin = (self.ball == 0.0).all(axis=1)
+        idx = np.flatnonzero(active & ~at_origin)
+        if not idx.size:
+            return
+
+        n_players = self.players.shape[1]
+        change = (
+            self.rng.random((idx.size, n_players)) < CHANGE_ROUTE_PATTERN_PROB
+        )
+        if change.any():
+            spread = self.spread[idx]
+            spread[change] = self._random_spread((int(change.sum()), 2))
+            self.spread[idx] = spread
+
+        pos = self.players[idx]
+        delta = self.ball[idx, None, :] - pos
+        self.orientations[idx] = -np.arctan2(delta[..., 0], delta[..., 1])
+
+        d = np.hypot(delta[..., 0], delta[..., 1])
+        defense = np.array([DEFENSE_POSITION_X, DEFENSE_POSITION_Y])
+        step = np.where(
+            (d > THRESHOLD_DISTANCE_FOR_DEFENSE)[..., None],
+            0.03 * (defense - pos),
+            0.02 * delta,
+        )
+        self.players[idx] = pos + self.spread[idx] + step
+
+    def _random_spread(self, shape: tuple[int, ...]) -> np.ndarray:
+        sf = PlayerSwarm.SPREAD_FACTOR
+        return self.rng.integers(-sf, sf + 1, size=shape).astype(np.float64)
+
+
+class RandomBatchController:
+    """
+    Vectorized RandomController: every match holds a random arrow-key
+    combination for a random number of ticks.
+    """
+
+    def __init__(
+        self,
+        n_matches: int,
+        seed: int | None = None,
+        min_hold: int = 10,
+        max_hold: int = 60,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.keys = np.zeros((n_matches, N_KEYS), dtype=bool)
+        self.hold = np.zeros(n_matches, dtype=np.int64)
+
+    def __call__(self, simulation: BatchSimulation) -> np.ndarray:
+        expired = np.flatnonzero(self.hold <= 0)
+        if expired.size:
+            choices = self.rng.integers(
+                len(_AXIS_CHOICES), size=(2, expired.size)
+            )
+            self.keys[expired] = False
+            self.keys[expired, KEY_LEFT : KEY_RIGHT + 1] = _AXIS_CHOICES[
+                choices[0]
+            ]
+            self.keys[expired, KEY_UP : KEY_DOWN + 1] = _AXIS_CHOICES[
+                choices[1]
+            ]
+            self.hold[expired] = self.rng.integers(
+                self.min_hold, self.max_hold + 1, size=expired.size
+            )
+        self.hold -= 1
+        return self.keys
@@ -1,5 +1,16 @@
 import numpy as np
-from OpenGL.GL import GL_POINTS, glBegin, glColor3f, glEnd, glVertex2f
+from OpenGL.GL import (
+    GL_FLOAT,
+    GL_POINTS,
+    GL_VERTEX_ARRAY,
+    glColor3f,
+    glDisableClientState,
+    glDrawArrays,
+    glEnableClientState,
+    glVertexPointer,
+)
+
+from soccer.tracing import traced
 
 
 def bresenham_line(A: np.ndarray, B: np.ndarray):
@@ -7,49 +18,60 @@ def bresenham_line(A: np.ndarray, B: np.ndarray):
     Draws a line between two points using adapted Bresenham's algorithm.
     Reference: https://en.wikipedia.org/wiki/Bresenham%27s_line_algorithm
     """
-    dx = abs(A[0] - B[0])
+    draw_points(bresenham_line_points(A, B))
+
+
+def bresenham_circle(C: np.ndarray, r: float):
+    """
+    Draws a circle centered at C using Bresenham's algorithm for circles.
+    Reference: https://en.wikipedia.org/wiki/Midpoint_circle_algorithm
+    """
+    draw_points(bresenham_circle_points(C, r))
+
+
+@traced('bresenham_line_points')
+def bresenham_line_points(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """
+    Points of the Bresenham line from A to B as an (n, 2) float32 array.
+    Along the major axis every step moves one unit, and the minor axis
+    has moved round(i * minor / major) units at step i, rounding halves
+    down, which is exactly where the error term of the incremental
+    algorithm crosses zero.
+    """
+    dx = abs(int(B[0] - A[0]))
+    dy = abs(int(B[1] - A[1]))
     sx = 1 if A[0] < B[0] else -1
-    dy = -abs(A[1] - B[1])
     sy = 1 if A[1] < B[1] else -1
-    error = dx + dy
-
-    x = A[0]
-    y = A[1]
 
-    glBegin(GL_POINTS)
-    glColor3f(1.0, 1.0, 1.0)
-    while True:
-        glVertex2f(x, y)
-        e = 2 * error
-        if e >= dy:
-            if x == B[0]:
-                break
-            error += dy
-            x += sx
+    major, minor = max(dx, dy), min(dx, dy)
+    i = np.arange(major + 1)
+    k = (2 * i * minor + major) // (2 * major) if major else i
 
-        if e <= dx:
-            if y == B[1]:
-                break
-            error += dx
-            y += sy
-    glEnd()
+    points = np.empty((major + 1, 2), dtype=np.float32)
+    if dx >= dy:
+        points[:, 0] = A[0] + sx * i
+        points[:, 1] = A[1] + sy * k
+    else:
+        points[:, 0] = A[0] + sx * k
+        points[:, 1] = A[1] + sy * i
+    return points
 
 
-def bresenham_circle(C: np.ndarray, r: float):
+@traced('bresenham_circle_points')
+def bresenham_circle_points(C: np.ndarray, r: float) -> np.ndarray:
     """
-    Draws a circle centered at C using Bresenham's algorithm for circles.
-    Reference: https://en.wikipedia.org/wiki/Midpoint_circle_algorithm
+    Points of the Bresenham circle of radius r centered at C as an (n, 2)
+    float32 array. Only the first octant is walked, the other seven are
+    mirrored from it.
     """
     t1 = r / 16
     t2 = 0
     x = r
     y = 0
 
-    glBegin(GL_POINTS)
-    glColor3f(1.0, 1.0, 1.0)
-
+    octant = []
     while x >= y:
-        _draw_simetric_points(C[0], C[1], x, y)
+        octant.append((x, y))
         y += 1
         t1 += y
         t2 = t1 - x
@@ -57,15 +79,28 @@ def bresenham_circle(C: np.ndarray, r: float):
             t1 = t2
             x -= 1
 
-    glEnd()
+    x, y = np.array(octant, dtype=np.float64).reshape(-1, 2).T
+    points = np.concatenate([
+        np.stack([x, y], axis=1),
+        np.stack([-x, y], axis=1),
+        np.stack([x, -y], axis=1),
+        np.stack([-x, -y], axis=1),
+        np.stack([y, x], axis=1),
+        np.stack([-y, x], axis=1),
+        np.stack([y, -x], axis=1),
+        np.stack([-y, -x], axis=1),
+    ])
+    return (points + np.asarray(C, dtype=np.float64)).astype(np.float32)
 
 
-def _draw_simetric_points(xc: float, yc: float, x: float, y: float):
-    glVertex2f(xc + x, yc + y)
-    glVertex2f(xc - x, yc + y)
-    glVertex2f(xc + x, yc - y)
-    glVertex2f(xc - x, yc - y)
-    glVertex2f(xc + y, yc + x)
-    glVertex2f(xc - y, yc + x)
-    glVertex2f(xc + y, yc - x)
-    glVertex2f(xc - y, yc - x)
+@traced('draw_points')
+def draw_points(points: np.ndarray):
+    """
+    Draws an (n, 2) float32 array of white points with a single
+    glDrawArrays call.
+    """
+    glColor3f(1.0, 1.0, 1.0)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, points)
+    glDrawArrays(GL_POINTS, 0, len(points))
+    glDisableClientState(GL_VERTEX_ARRAY)
@@ -1,18 +1,21 @@
 from typing import Callable
 
+import numpy as np
 from OpenGL.GL import (
     GL_LINE_LOOP,
+    GL_LINES,
     GL_QUADS,
+    GL_TRIANGLES,
     glBegin,
     glColor3f,
     glEnd,
     glLineWidth,
-    glPopMatrix,
-    glPushMatrix,
-    glRasterPos2f,
     glVertex2f,
 )
-from OpenGL.GLUT import GLUT_BITMAP_9_BY_15, glutBitmapCharacter
+from OpenGL.GLUT import GLUT_BITMAP_9_BY_15
+
+from soccer.render_queue import DrawItem, Layer, RenderQueue
+from soccer.text import draw_bitmap_text
 
 
 class Button:
@@ -60,19 +63,44 @@ class Button:
 
         self.draw_text()
 
+    def submit(self, queue: RenderQueue):
+        """
+        Queues the same drawing as draw(): the fill and border as vertex
+        arrays, the label as a call since it is GLUT text.
+        """
+        x, y = self.position
+        x1, y1 = x + self.width, y + self.height
+        color = self.hover_color if self.is_hovered else self.color
+        corners = np.array([(x, y), (x1, y), (x1, y1), (x, y1)])
+
+        queue.submit(
+            DrawItem(
+                Layer.PANELS, GL_TRIANGLES, corners[[0, 1, 2, 0, 2, 3]], color
+            )
+        )
+        queue.submit(
+            DrawItem(
+                Layer.OUTLINES,
+                GL_LINES,
+                corners[[0, 1, 1, 2, 2, 3, 3, 0]],
+                (0.2, 0.2, 0.2),
+                line_width=2.0,
+            )
+        )
+        queue.call(Layer.TEXT, self.draw_text)
+
     def draw_text(self):
         x, y = self.position
         text_x = x + self.width / 2
         text_y = y + self.height / 2
 
         glColor3f(*self.text_color)
-        glPushMatrix()
-        glRasterPos2f(text_x - len(self.text) * 4.5, text_y - 5)
-
-        for char in self.text:
-            glutBitmapCharacter(GLUT_BITMAP_9_BY_15, ord(char))
-
-        glPopMatrix()
+        draw_bitmap_text(
+            text_x - len(self.text) * 4.5,
+            text_y - 5,
+            self.text,
+            GLUT_BITMAP_9_BY_15,
+        )
 
     def update(self, mx: float, my: float):
         self.is_hovered = self._is_point_inside(mx, my)
@@ -0,0 +1,54 @@
+class SimulationClock:
+    """
+    Fixed-timestep clock. Real time is scaled by time_scale and banked in an
+    accumulator that advance() turns into whole simulation steps; what is
+    left over is the fraction of a step the renderer should interpolate by.
+    Simulation time only moves when tick() is called, once per step, so a
+    run behaves the same at any speed.
+    """
+
+    def __init__(
+        self,
+        step: float = 1 / 60,
+        time_scale: float = 1.0,
+        max_frame_time: float = 0.25,
+    ):
+        self.step = step
+        self.time_scale = time_scale
+        self.max_frame_time = max_frame_time
+        self.ticks = 0
+        self.accumulator = 0.0
+
+    @property
+    def time(self) -> float:
+        return self.ticks * self.step
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step
+
+    def now(self) -> float:
+        """
+        Simulation time including the part of the current step that has
+        already elapsed, for animations drawn between steps.
+        """
+        return self.time + self.accumulator
+
+    def advance(self, real_dt: float) -> int:
+        """
+        Banks real_dt seconds of wall-clock time and returns how many steps
+        the simulation should run now. Frames longer than max_frame_time
+        are clamped, so after a hitch the simulation slows down instead of
+        spiralling into ever longer catch-up frames.
+        """
+        real_dt = min(real_dt, self.max_frame_time)
+        self.accumulator += real_dt * self.time_scale
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    def tick(self):
+        self.ticks += 1
+
+    def to_ticks(self, seconds: float) -> int:
+        return round(seconds / self.step)
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum, auto
 
+import numpy as np
+
+from soccer.tracing import traced
+
 
 class Collision(Enum):
     NONE = auto()
@@ -27,6 +33,20 @@ class BoundingBox:
         return f'({self.x_min}, {self.y_min}) to ({self.x_max}, {self.y_max})'
 
 
+def aabb_collision_batch(boxes: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Vectorized CollisionSystem.aabb_collision. Both arguments are arrays of
+    (x_min, y_min, x_max, y_max) rows; returns an (M, N) boolean matrix.
+    """
+    boxes = boxes[:, None, :]
+    return ~(
+        (boxes[..., 2] < others[:, 0])
+        | (boxes[..., 0] > others[:, 2])
+        | (boxes[..., 3] < others[:, 1])
+        | (boxes[..., 1] > others[:, 3])
+    )
+
+
 class Collidable(ABC):
     @abstractmethod
     def check_collision(self, bb: BoundingBox) -> Collision: ...
@@ -34,23 +54,286 @@ class Collidable(ABC):
     @abstractmethod
     def get_bounding_box(self) -> BoundingBox: ...
 
+    def check_collisions_batch(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Collision.value of check_collision() for every row of an (M, 4)
+        array of boxes. Subclasses override it with a vectorized version.
+        """
+        return np.array(
+            [self.check_collision(BoundingBox(*box)).value for box in boxes],
+            dtype=np.int64,
+        )
+
+
+class BoxIndex:
+    """
+    Precomputed first-match lookup over a fixed list of (box, collision)
+    pairs. Two boxes overlap when q.x_min <= b.x_max and q.x_max >= b.x_min
+    (and likewise for y), so each of the four query edges is bisected into
+    the sorted edges of the zones to get a bitmask of the zones it allows.
+    The lowest bit of the four masks ANDed together is the first zone, in
+    list order, that the query overlaps.
+    """
+
+    def __init__(self, zones: list[tuple[BoundingBox, Collision]]):
+        self.collisions = [collision for _, collision in zones]
+        boxes = [bb for bb, _ in zones]
+        self.x_max = self._edge_masks(
+            [bb.x_max for bb in boxes], at_least=True
+        )
+        self.y_max = self._edge_masks(
+            [bb.y_max for bb in boxes], at_least=True
+        )
+        self.x_min = self._edge_masks(
+            [bb.x_min for bb in boxes], at_least=False
+        )
+        self.y_min = self._edge_masks(
+            [bb.y_min for bb in boxes], at_least=False
+        )
+
+        # Boolean expansion of the masks, used by query_batch
+        self.codes = np.array(
+            [c.value for c in self.collisions], dtype=np.int64
+        )
+        self.tables = [
+            (values, self._mask_table(masks, len(boxes)), column, side)
+            for (values, masks), column, side in (
+                (self.x_max, 0, 'left'),
+                (self.y_max, 1, 'left'),
+                (self.x_min, 2, 'right'),
+                (self.y_min, 3, 'right'),
+            )
+        ]
+
+    def query(self, bb: BoundingBox) -> Collision:
+        x_max, x_max_masks = self.x_max
+        y_max, y_max_masks = self.y_max
+        x_min, x_min_masks = self.x_min
+        y_min, y_min_masks = self.y_min
+        mask = (
+            x_max_masks[bisect_left(x_max, bb.x_min)]
+            & y_max_masks[bisect_left(y_max, bb.y_min)]
+            & x_min_masks[bisect_right(x_min, bb.x_max)]
+            & y_min_masks[bisect_right(y_min, bb.y_max)]
+        )
+        if not mask:
+            return Collision.NONE
+        return self.collisions[(mask & -mask).bit_length() - 1]
+
+    def query_batch(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        Collision.value of query() for every row of an (M, 4) array. The
+        masks are expanded to one boolean column per zone, so the first
+        match is the argmax over the ANDed rows.
+        """
+        if not len(self.codes):
+            return np.full(len(boxes), Collision.NONE.value, dtype=np.int64)
+
+        hits = np.ones((len(boxes), len(self.codes)), dtype=bool)
+        for values, table, column, side in self.tables:
+            hits &= table[np.searchsorted(values, boxes[:, column], side)]
+
+        return np.where(
+            hits.any(axis=1),
+            self.codes[hits.argmax(axis=1)],
+            Collision.NONE.value,
+        )
+
+    @staticmethod
+    def _mask_table(masks: list[int], n_zones: int) -> np.ndarray:
+        bits = 1 << np.arange(n_zones, dtype=object)
+        return np.array([(mask & bits) != 0 for mask in masks], dtype=bool)
+
+    @staticmethod
+    def _edge_masks(
+        edges: list[float], at_least: bool
+    ) -> tuple[list[float], list[int]]:
+        """
+        Sorted distinct edge values plus, for every bisect position, the
+        mask of zones whose edge is >= (at_least) or <= the query value.
+        """
+        values = sorted(set(edges))
+        at_value = [0] * len(values)
+        for i, edge in enumerate(edges):
+            at_value[bisect_left(values, edge)] |= 1 << i
+
+        masks = [0] * (len(values) + 1)
+        if at_least:
+            for j in reversed(range(len(values))):
+                masks[j] = masks[j + 1] | at_value[j]
+        else:
+            for j in range(len(values)):
+                masks[j + 1] = masks[j] | at_value[j]
+        return values, masks
+
+
+class SpatialHash:
+    """
+    Uniform grid that maps integer keys to the cells their bounding boxes
+    overlap. Moving a key only touches the grid when its cells change.
+    """
+
+    cells: dict[tuple[int, int], set[int]]
+    ranges: dict[int, tuple[int, int, int, int]]
+    boxes: dict[int, BoundingBox]
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+        self.ranges = {}
+        self.boxes = {}
+
+    def insert(self, key: int, bb: BoundingBox):
+        cell_range = self._cell_range(bb)
+        self.ranges[key] = cell_range
+        self.boxes[key] = bb
+        for cell in self._cells(cell_range):
+            self.cells[cell].add(key)
+
+    def update(self, key: int, bb: BoundingBox):
+        # Same box object as last time means the entity did not move
+        if self.boxes.get(key) is bb:
+            return
+        self.boxes[key] = bb
+        cell_range = self._cell_range(bb)
+        if self.ranges.get(key) == cell_range:
+            return
+        self.remove(key)
+        self.insert(key, bb)
+
+    def remove(self, key: int):
+        self.boxes.pop(key, None)
+        cell_range = self.ranges.pop(key, None)
+        if cell_range is None:
+            return
+        for cell in self._cells(cell_range):
+            bucket = self.cells[cell]
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def query(self, bb: BoundingBox) -> set[int]:
+        found = set()
+        for cell in self._cells(self._cell_range(bb)):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found |= bucket
+        return found
+
+    def _cell_range(self, bb: BoundingBox) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            int(bb.x_min // size),
+            int(bb.y_min // size),
+            int(bb.x_max // size),
+            int(bb.y_max // size),
+        )
+
+    @staticmethod
+    def _cells(cell_range: tuple[int, int, int, int]):
+        x_min, y_min, x_max, y_max = cell_range
+        for cx in range(x_min, x_max + 1):
+            for cy in range(y_min, y_max + 1):
+                yield cx, cy
+
 
 class CollisionSystem:
     collidables: list[Collidable]
 
-    def __init__(self):
+    def __init__(self, cell_size: float | None = None):
         self.collidables = []
+        self.broad_phase = SpatialHash(cell_size) if cell_size else None
+        self.unindexed = []
+        self.indexed = {}
 
-    def add_collidable(self, c: Collidable):
+    def add_collidable(self, c: Collidable, indexed: bool = False):
+        """
+        Registers `c`. Indexed collidables go into the spatial hash and are
+        only tested when their box is near the query; call
+        update_collidable() whenever they move. The others are tested on
+        every query. Either way the first match in insertion order wins.
+        """
+        index = len(self.collidables)
         self.collidables.append(c)
+        if indexed and self.broad_phase:
+            self.indexed[id(c)] = index
+            self.broad_phase.insert(index, c.get_bounding_box())
+        else:
+            self.unindexed.append(index)
+
+    def update_collidable(self, c: Collidable):
+        index = self.indexed.get(id(c))
+        if index is not None:
+            self.broad_phase.update(index, c.get_bounding_box())
 
+    @traced('CollisionSystem.check_collisions')
     def check_collisions(self, bb: BoundingBox) -> Collision:
-        for collidable in self.collidables:
+        if self.broad_phase:
+            candidates = sorted([
+                *self.unindexed,
+                *self.broad_phase.query(bb),
+            ])
+            collidables = [self.collidables[i] for i in candidates]
+        else:
+            collidables = self.collidables
+
+        for collidable in collidables:
             result = collidable.check_collision(bb)
             if result != Collision.NONE:
                 return result
         return Collision.NONE
 
+    def check_collisions_batch(
+        self, boxes: np.ndarray, chunk_size: int = 1 << 22
+    ) -> np.ndarray:
+        """
+        check_collisions() for every row of an (M, 4) array of boxes,
+        returned as an array of Collision.value codes. Indexed collidables
+        are broad-phased all at once against their current boxes, so each
+        one only narrow-phases the rows that touch it.
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        result = np.full(len(boxes), Collision.NONE.value, dtype=np.int64)
+
+        indexed = sorted(self.indexed.values())
+        indexed_boxes = np.array([
+            self._box_row(self.collidables[i]) for i in indexed
+        ]).reshape(-1, 4)
+
+        rows = max(1, chunk_size // max(1, len(indexed)))
+        for start in range(0, len(boxes), rows):
+            chunk = slice(start, start + rows)
+            result[chunk] = self._check_chunk(
+                boxes[chunk], indexed, indexed_boxes
+            )
+        return result
+
+    def _check_chunk(
+        self, boxes: np.ndarray, indexed: list[int], indexed_boxes: np.ndarray
+    ) -> np.ndarray:
+        result = np.full(len(boxes), Collision.NONE.value, dtype=np.int64)
+        near = aabb_collision_batch(boxes, indexed_boxes)
+        candidates = {
+            index: near[:, column]
+            for column, index in enumerate(indexed)
+            if near[:, column].any()
+        }
+
+        for index in sorted([*self.unindexed, *candidates]):
+            pending = result == Collision.NONE.value
+            if index in candidates:
+                pending &= candidates[index]
+            rows = np.flatnonzero(pending)
+            if rows.size:
+                collidable = self.collidables[index]
+                result[rows] = collidable.check_collisions_batch(boxes[rows])
+        return result
+
+    @staticmethod
+    def _box_row(c: Collidable) -> tuple[float, float, float, float]:
+        bb = c.get_bounding_box()
+        return bb.x_min, bb.y_min, bb.x_max, bb.y_max
+
     @staticmethod
     def aabb_collision(a: BoundingBox, b: BoundingBox) -> bool:
         return not (
@@ -1,48 +1,48 @@
 import numpy as np
-import pygame
 from OpenGL.GL import (
-    GL_LINEAR,
-    GL_QUADS,
-    GL_REPEAT,
-    GL_RGBA,
-    GL_TEXTURE_2D,
-    GL_TEXTURE_MAG_FILTER,
-    GL_TEXTURE_MIN_FILTER,
-    GL_TEXTURE_WRAP_S,
-    GL_TEXTURE_WRAP_T,
-    GL_TRIANGLE_FAN,
-    GL_UNSIGNED_BYTE,
-    glBegin,
-    glBindTexture,
-    glDisable,
-    glEnable,
-    glEnd,
-    glGenTextures,
-    glPopMatrix,
-    glPushMatrix,
-    glRotatef,
-    glTexCoord2f,
-    glTexImage2D,
-    glTexParameteri,
-    glVertex2f,
-    glVertex3f,
+    GL_POINTS,
+    GL_TRIANGLES,
 )
 
-from soccer.bresenham import bresenham_circle, bresenham_line
+from soccer.bresenham import (
+    bresenham_circle_points,
+    bresenham_line_points,
+)
 from soccer.collision import (
     BoundingBox,
+    BoxIndex,
     Collidable,
     Collision,
-    CollisionSystem,
 )
+from soccer.layer import CachedLayer
+from soccer.render_queue import DrawItem, Layer, RenderQueue
+from soccer.textures import texture_cache
+from soccer.tracing import span, traced
+
+GRASS_TEXTURE = 'soccer/assets/grass3.jpg'
 
 
 class Field(Collidable):
+    # Rasterized line points per size_factor, shared by every Field
+    _line_points_cache: dict[int, np.ndarray] = {}
+
     def __init__(
         self,
         size_factor: int = 1,
-        texture_path: str = 'soccer/assets/grass3.jpg',
+        texture_path: str | None = GRASS_TEXTURE,
     ):
+        self.layer = CachedLayer()
+        self.resize(size_factor)
+        self.texture = (
+            self.load_texture(texture_path) if texture_path else None
+        )
+
+    def resize(self, size_factor: int):
+        """
+        Sets the field geometry. Boundary zones are rebuilt from scratch,
+        so zones added with add_zone() are dropped.
+        """
+        self.size_factor = size_factor
         self.width = size_factor * 90.0
         self.length = size_factor * 120.0
         self.center_radius = size_factor * 14.15
@@ -53,84 +53,93 @@ class Field(Collidable):
         self.goal_length = size_factor * 8.5
         self.goal_width = size_factor * 18.3
         self.bounding_boxes = self.get_bounding_box()
+        self.region_index = BoxIndex(self.bounding_boxes)
+        self.layer.invalidate()
+
+    def set_texture(self, texture_path: str):
         self.texture = self.load_texture(texture_path)
-        
+        self.layer.invalidate()
 
     @staticmethod
     def load_texture(texture_path):
-        texture_surface = pygame.image.load(texture_path)
-        texture_data = pygame.image.tostring(texture_surface, 'RGBA', True)
-        width, height = texture_surface.get_size()
-
-        texture_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
-            GL_RGBA,
-            width,
-            height,
-            0,
-            GL_RGBA,
-            GL_UNSIGNED_BYTE,
-            texture_data,
-        )
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-        return texture_id
+        return texture_cache.load(texture_path)
 
+    @traced('Field.draw')
     def draw(self):
-        glPushMatrix()
-
-        glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, self.texture)
-
-        glBegin(GL_QUADS)
-        glTexCoord2f(0.0, 0.0)
-        glVertex3f(-self.width / 2, -self.length / 2, 0.0)
-
-        glTexCoord2f(5.0, 0.0)
-        glVertex3f(self.width / 2, -self.length / 2, 0.0)
+        # Nothing in the field moves, so it is drawn from a cached texture
+        self.layer.draw(self._draw_static)
 
-        glTexCoord2f(5.0, 5.0)
-        glVertex3f(self.width / 2, self.length / 2, 0.0)
-
-        glTexCoord2f(0.0, 5.0)
-        glVertex3f(-self.width / 2, self.length / 2, 0.0)
-        glEnd()
-
-        glDisable(GL_TEXTURE_2D)
+    @traced('Field._draw_static')
+    def _draw_static(self):
+        queue = RenderQueue()
+        with span('Field.grass'):
+            w, h = self.width / 2, self.length / 2
+            corners = np.array([(-w, -h), (w, -h), (w, h), (-w, h)])
+            texcoords = np.array([(0, 0), (5, 0), (5, 5), (0, 5)])
+            quad = [0, 1, 2, 0, 2, 3]
+            queue.submit(
+                DrawItem(
+                    Layer.FIELD,
+                    GL_TRIANGLES,
+                    corners[quad],
+                    texture=self.texture or 0,
+                    texcoords=texcoords[quad],
+                )
+            )
 
-        self._draw_field()
-        self._draw_center()
+        with span('Field.lines'):
+            queue.submit(
+                DrawItem(Layer.MARKINGS, GL_POINTS, self.line_points())
+            )
 
-        self._draw_big_area()
-        glRotatef(180, 1, 0, 0)
-        self._draw_big_area()
+        with span('Field.marks'):
+            for y in (
+                0,
+                -3 * self.small_area_length,
+                3 * self.small_area_length,
+            ):
+                queue.submit(
+                    DrawItem(Layer.MARKINGS, GL_TRIANGLES, self._mark(0, y))
+                )
 
-        self._draw_small_area()
-        glRotatef(180, 1, 0, 0)
-        self._draw_small_area()
+        queue.flush()
 
-        self._draw_goal()
-        glRotatef(180, 1, 0, 0)
-        self._draw_goal()
+    def line_points(self) -> np.ndarray:
+        """
+        Every Bresenham point of the pitch markings. The areas and goals
+        are drawn at the top end and mirrored to the bottom one.
+        """
+        points = self._line_points_cache.get(self.size_factor)
+        if points is None:
+            mirrored = np.concatenate([
+                *self._big_area_points(),
+                *self._small_area_points(),
+                *self._goal_points(),
+            ])
+            points = np.concatenate([
+                *self._field_points(),
+                *self._center_points(),
+                mirrored,
+                mirrored * np.array([1.0, -1.0], dtype=np.float32),
+            ])
+            self._line_points_cache[self.size_factor] = points
+        return points
 
-        Field._draw_mark(0, 0)
-        Field._draw_mark(0, -3 * self.small_area_length)
-        Field._draw_mark(0, 3 * self.small_area_length)
+    def check_collision(self, bb: BoundingBox) -> Collision:
+        return self.region_index.query(bb)
 
-        glPopMatrix()
+    def check_collisions_batch(self, boxes: np.ndarray) -> np.ndarray:
+        return self.region_index.query_batch(boxes)
 
-    def check_collision(self, bb: BoundingBox) -> Collision:
-        for section_bb, collision_type in self.bounding_boxes:
-            if CollisionSystem.aabb_collision(bb, section_bb):
-                return collision_type
-        return Collision.NONE
+    def add_zone(self, bb: BoundingBox, collision: Collision):
+        """
+        Appends a boundary zone (penalty area, offside line...). Zones keep
+        first-match priority, so it only applies where no earlier zone does.
+        """
+        self.bounding_boxes.append((bb, collision))
+        self.region_index = BoxIndex(self.bounding_boxes)
 
-    def _draw_field(self):
+    def _field_points(self) -> list[np.ndarray]:
         A = np.array([-self.width / 2, -self.length / 2], dtype=np.float32)
         B = np.array([-self.width / 2, self.length / 2], dtype=np.float32)
         C = np.array([self.width / 2, self.length / 2], dtype=np.float32)
@@ -138,17 +147,19 @@ class Field(Collidable):
         E = np.array([-self.width / 2, 0.0], dtype=np.float32)
         F = np.array([self.width / 2, 0.0], dtype=np.float32)
 
-        bresenham_line(A, B)
-        bresenham_line(B, C)
-        bresenham_line(C, D)
-        bresenham_line(D, A)
-        bresenham_line(E, F)
+        return [
+            bresenham_line_points(A, B),
+            bresenham_line_points(B, C),
+            bresenham_line_points(C, D),
+            bresenham_line_points(D, A),
+            bresenham_line_points(E, F),
+        ]
 
-    def _draw_center(self):
+    def _center_points(self) -> list[np.ndarray]:
         CENTER = np.array([0.0, 0.0], dtype=np.float32)
-        bresenham_circle(CENTER, self.center_radius)
+        return [bresenham_circle_points(CENTER, self.center_radius)]
 
-    def _draw_big_area(self):
+    def _big_area_points(self) -> list[np.ndarray]:
         A = np.array(
             [
                 -self.big_area_width // 2,
@@ -170,11 +181,13 @@ class Field(Collidable):
             [self.big_area_width // 2, self.length // 2], dtype=np.float32
         )
 
-        bresenham_line(A, C)
-        bresenham_line(A, B)
-        bresenham_line(B, D)
+        return [
+            bresenham_line_points(A, C),
+            bresenham_line_points(A, B),
+            bresenham_line_points(B, D),
+        ]
 
-    def _draw_small_area(self):
+    def _small_area_points(self) -> list[np.ndarray]:
         A = np.array(
             [
                 -self.small_area_width // 2,
@@ -196,11 +209,13 @@ class Field(Collidable):
             [self.small_area_width // 2, self.length // 2], dtype=np.float32
         )
 
-        bresenham_line(A, C)
-        bresenham_line(A, B)
-        bresenham_line(B, D)
+        return [
+            bresenham_line_points(A, C),
+            bresenham_line_points(A, B),
+            bresenham_line_points(B, D),
+        ]
 
-    def _draw_goal(self):
+    def _goal_points(self) -> list[np.ndarray]:
         A = np.array(
             [
                 -self.goal_width // 2,
@@ -222,25 +237,29 @@ class Field(Collidable):
             [self.goal_width // 2, self.length // 2], dtype=np.float32
         )
 
-        bresenham_line(A, B)
-        bresenham_line(A, C)
-        bresenham_line(B, D)
+        return [
+            bresenham_line_points(A, B),
+            bresenham_line_points(A, C),
+            bresenham_line_points(B, D),
+        ]
 
     @staticmethod
-    def _draw_mark(x, y):
-        CENTER = np.array([x, y], dtype=np.float32)
+    def _mark(x: float, y: float) -> np.ndarray:
+        """
+        Triangles of the filled circle the spots are drawn with.
+        """
         radius = 5
         num_segments = 100
 
-        glBegin(GL_TRIANGLE_FAN)
-        glVertex2f(CENTER[0], CENTER[1])
-        for i in range(num_segments + 1):
-            angle = 2.0 * np.pi * i / num_segments
-            glVertex2f(
-                CENTER[0] + (radius * np.cos(angle)),
-                CENTER[1] + (radius * np.sin(angle)),
-            )
-        glEnd()
+        angles = 2.0 * np.pi * np.arange(num_segments + 1) / num_segments
+        rim = np.stack(
+            [x + radius * np.cos(angles), y + radius * np.sin(angles)], 1
+        )
+        fan = np.empty((num_segments, 3, 2))
+        fan[:, 0] = (x, y)
+        fan[:, 1] = rim[:-1]
+        fan[:, 2] = rim[1:]
+        return fan.reshape(-1, 2)
 
     def get_bounding_box(self) -> tuple[BoundingBox, Collision]:
         tol = 25.0
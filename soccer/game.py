@@ -1,75 +1,134 @@
+import random
 import time
 
 import pygame
 from OpenGL.GL import (
-    GL_COLOR_BUFFER_BIT,
     GL_MODELVIEW,
     GL_PROJECTION,
-    glClear,
-    glClearColor,
     glLoadIdentity,
     glMatrixMode,
     glOrtho,
 )
 from OpenGL.GLUT import glutInit
 
-from soccer.ball import Ball
+from soccer.audio import Sound
+from soccer.ball import BALL_TEXTURE
 from soccer.button import Button
-from soccer.collision import CollisionSystem
-from soccer.field import Field
-from soccer.overlay import TextOverlay
-from soccer.players import get_n_players
-from soccer.score import Score
+from soccer.field import GRASS_TEXTURE
+from soccer.glstats import GLCounter
+from soccer.profiler import FrameProfiler, ProfilerHUD
+from soccer.renderer import create_renderer
+from soccer.replay import InputLog, InputRecorder
+from soccer.simulation import DEFAULT_FORMATION, Simulation
+from soccer.snapshot import SimulationThread, Snapshot
+from soccer.startup import StartupPipeline
+from soccer.textures import texture_cache
+from soccer.tracing import span
+
+# Shows or hides the frame profiler HUD
+HUD_KEY = pygame.K_F3
 
 
 class Game:
-    def __init__(self):
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        size_factor: int = 6,
+        formation: list[tuple[float, float]] = DEFAULT_FORMATION,
+        player_size: float = 14.0,
+        seed: int | None = None,
+        time_scale: float = 1.0,
+        record_path: str | None = None,
+        gl_stats: bool = False,
+        renderer: str = 'legacy',
+        startup_report: bool = False,
+        threaded: bool = False,
+    ):
         self.win_width = 1000
         self.win_height = 800
-        pygame.init()
-        pygame.mixer.init()
-        pygame.display.set_mode(
-            (self.win_width, self.win_height), pygame.OPENGL | pygame.DOUBLEBUF
+        # Decoding starts first so it overlaps the window and GL setup
+        self.startup = StartupPipeline()
+        self.startup_report = startup_report
+        for path in (GRASS_TEXTURE, BALL_TEXTURE):
+            texture_cache.prefetch(path, self.startup)
+
+        with self.startup.stage('pygame.init'):
+            pygame.init()
+            pygame.mixer.init()
+        # Loads on the audio thread, outside the startup pipeline
+        self.opening_sfx = Sound(
+            'soccer/assets/galvao-opening.mp3', max_delay=None
         )
-        pygame.display.set_caption('Futebol')
+        self.opening_sfx.load_async()
+
+        with self.startup.stage('window'):
+            if renderer == 'shader':
+                # A forward compatible 3.3 core context, the most macOS
+                # offers
+                pygame.display.gl_set_attribute(
+                    pygame.GL_CONTEXT_MAJOR_VERSION, 3
+                )
+                pygame.display.gl_set_attribute(
+                    pygame.GL_CONTEXT_MINOR_VERSION, 3
+                )
+                pygame.display.gl_set_attribute(
+                    pygame.GL_CONTEXT_PROFILE_MASK,
+                    pygame.GL_CONTEXT_PROFILE_CORE,
+                )
+                pygame.display.gl_set_attribute(
+                    pygame.GL_CONTEXT_FLAGS,
+                    pygame.GL_CONTEXT_FORWARD_COMPATIBLE_FLAG,
+                )
+            pygame.display.set_mode(
+                (self.win_width, self.win_height),
+                pygame.OPENGL | pygame.DOUBLEBUF,
+            )
+            pygame.display.set_caption('Futebol')
 
-        glutInit()
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(-500, 500, -400, 400, -1000, 1000)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+        if renderer == 'legacy':
+            with self.startup.stage('glutInit'):
+                glutInit()
+                glMatrixMode(GL_PROJECTION)
+                glLoadIdentity()
+                glOrtho(-500, 500, -400, 400, -1000, 1000)
+                glMatrixMode(GL_MODELVIEW)
+                glLoadIdentity()
 
-        self.pause = 0.0
         self.clock = pygame.time.Clock()
-        self.field = Field(size_factor=6)
-        self.ball = Ball(field=self.field)
-        self.players = get_n_players(
-            positions=[
-                (85.0, 70.0),
-                (-85.0, 70.0),
-                (180.0, 150.0),
-                (0.0, 150.0),
-                (-180.0, 150.0),
-                (85.0, 240.0),
-                (0.0, 240.0),
-                (-85.0, 240.0),
-            ],
-            size=14.0,
-        )
+        # A recording is only replayable if the players' RNG is seeded
+        if record_path and seed is None:
+            seed = random.randrange(2**31)
+        # Uploads the textures as soon as their workers are done
+        with self.startup.stage('simulation'):
+            self.simulation = Simulation(
+                size_factor=size_factor,
+                formation=formation,
+                player_size=player_size,
+                headless=False,
+                seed=seed,
+                time_scale=time_scale,
+            )
+        self.field = self.simulation.field
+        self.ball = self.simulation.ball
+        self.players = self.simulation.players
+        self.score = self.simulation.score
+        self.overlay = self.simulation.overlay
+        self.collision_system = self.simulation.collision_system
+        with self.startup.stage('renderer'):
+            self.renderer = create_renderer(renderer)
+        self.record_path = record_path
+        if record_path:
+            self.simulation.recorder = InputRecorder(
+                InputLog.for_simulation(self.simulation)
+            )
+
+        # Steps on its own thread, handing snapshots over to this one
+        self.worker = SimulationThread(self.simulation) if threaded else None
+        self._init_profiling(gl_stats)
 
         self.button = Button(
             (-450, 240), 120, 50, 'Reset', self.on_reset_button_click
         )
-        self.collision_system = CollisionSystem()
-        self.collision_system.add_collidable(self.field)
-        self.opening_sfx = pygame.mixer.Sound(
-            'soccer/assets/galvao-opening.mp3'
-        )
-        self.score = Score()
-        for player in self.players:
-            self.collision_system.add_collidable(player)
-        self.overlay = TextOverlay()
 
     def convert_mouse_pos(self, mx: float, my: float):
         normalized_x = mx / self.win_width
@@ -81,68 +140,134 @@ class Game:
         return opengl_x, opengl_y
 
     def on_reset_button_click(self):
-        self.ball.reset_position()
-        self.score.reset_score()
-
-        for player in self.players:
-            player.reset_position()
-
-    def set_pause(self, t: float, reset_players: bool = True):
-        self.pause = time.time() + t
-
-        if reset_players:
-            for player in self.players:
-                player.reset_position()
+        self.simulation.request_reset()
 
     def run(self):
-        self.opening_sfx.play()
-
+        if self.worker:
+            self.worker.start()
         running = True
+        last_frame = time.perf_counter()
+        profile = self.profiler.section
         while running:
-            # Handle forced pause. No entity should move
-            if self.pause == 0.0:
-                running = self._update_entities()
-            elif time.time() > self.pause:
-                self.pause = 0.0
-
-            glClear(GL_COLOR_BUFFER_BIT)
-            glClearColor(0.0, 0.65, 0.075, 1)
-
-            self.field.draw()
-            self.ball.draw()
-            self.score.draw()
-            self.score.draw_goal_text()
-            for player in self.players:
-                player.draw()
-            self.button.draw()
-            self.overlay.draw()
-
-            pygame.display.flip()
+            with span('frame'), profile('frame'):
+                now = time.perf_counter()
+                if self.worker:
+                    running = self._hand_over_input()
+                    with profile('snapshot'):
+                        state = self.worker.snapshots.acquire()
+                        alpha = state.alpha
+                else:
+                    with profile('update'):
+                        running = self._update_entities(now - last_frame)
+                    state = self.simulation
+                    alpha = self.simulation.clock.alpha
+                last_frame = now
+                self._draw(state, alpha)
+
+                with profile('swap'):
+                    pygame.display.flip()
+            if self.startup.first_frame is None:
+                self._on_first_frame()
+            self.profiler.end_frame()
+            if self.gl_counter:
+                self.gl_counter.end_frame()
             self.clock.tick(60)
 
+        if self.worker:
+            self.worker.stop()
+        if self.record_path:
+            self.simulation.recorder.save(self.record_path, self.simulation)
+        if self.gl_counter:
+            print(self.gl_counter.report())
+            self.gl_counter.uninstall()
         pygame.quit()
 
-    def _update_entities(self) -> bool:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = self.convert_mouse_pos(*pygame.mouse.get_pos())
-                if self.button.is_clicked(mx, my):
-                    self.on_reset_button_click()
-            elif event.type == pygame.MOUSEMOTION:
-                mx, my = self.convert_mouse_pos(*pygame.mouse.get_pos())
-                self.button.update(mx, my)
-
-        keys = pygame.key.get_pressed()
-        self.ball.update(
-            keys,
-            self.collision_system,
-            self.score,
-            self.set_pause,
-            self.overlay,
-        )
-        for player in self.players:
-            player.update(*self.ball.position)
+    def _draw(self, state: Simulation | Snapshot, alpha: float):
+        """
+        Draws the entities of `state`, the simulation itself or a snapshot
+        of it, `alpha` of the way between its last two steps.
+        """
+        renderer = self.renderer
+        profile = self.profiler.section
+        renderer.begin_frame()
+        with profile('field'):
+            renderer.draw_field(self.field)
+        with profile('ball'):
+            renderer.draw_ball(state.ball, alpha)
+        with profile('score'):
+            renderer.draw_score(state.score)
+        with profile('players'):
+            renderer.draw_players(state.players, alpha)
+        with profile('button'):
+            renderer.draw_button(self.button)
+        with profile('overlay'):
+            renderer.draw_overlay(state.overlay)
+        with profile('hud'):
+            renderer.draw_hud(self.hud)
+        with profile('flush'):
+            renderer.end_frame()
+
+    def _on_first_frame(self):
+        self.startup.mark_first_frame()
+        self.opening_sfx.play()
+        # Lets queued work finish without waiting for it
+        self.startup.shutdown()
+        if self.startup_report:
+            print(self.startup.report())
+
+    def _update_entities(self, real_dt: float) -> bool:
+        keys = self._read_input()
+        if keys is None:
+            return False
+
+        self.simulation.advance(real_dt, keys)
 
         return True
+
+    def _hand_over_input(self) -> bool:
+        self.worker.check()
+        keys = self._read_input()
+        if keys is None:
+            return False
+
+        # The simulation thread picks them up on its next step
+        self.worker.keys = keys
+        return True
+
+    def _read_input(self) -> pygame.key.ScancodeWrapper | None:
+        """
+        Handles the window's events and returns the keys held down, or None
+        once the window was closed.
+        """
+        with self.profiler.section('input'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return None
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    mx, my = self.convert_mouse_pos(*pygame.mouse.get_pos())
+                    if self.button.is_clicked(mx, my):
+                        self.on_reset_button_click()
+                elif event.type == pygame.MOUSEMOTION:
+                    mx, my = self.convert_mouse_pos(*pygame.mouse.get_pos())
+                    self.button.update(mx, my)
+                elif event.type == pygame.KEYDOWN and event.key == HUD_KEY:
+                    self.hud.toggle()
+            return pygame.key.get_pressed()
+
+    def _init_profiling(self, gl_stats: bool):
+        self.profiler = FrameProfiler()
+        # The simulation thread times its collisions itself
+        if self.worker is None:
+            self.profiler.instrument(
+                self.collision_system, 'check_collisions', 'collisions'
+            )
+        # Optional debug layer counting GL calls per profiler section
+        self.gl_counter = None
+        if gl_stats:
+            self.gl_counter = GLCounter(self.profiler)
+            self.gl_counter.install()
+        self.hud = ProfilerHUD(
+            self.profiler,
+            self.gl_counter,
+            simulation=self.worker.profiler if self.worker else None,
+        )
@@ -0,0 +1,146 @@
+import sys
+from collections import Counter
+
+import OpenGL.GL
+import OpenGL.GLU
+import OpenGL.GLUT
+
+from soccer.profiler import FrameProfiler
+
+GL_MODULES = (OpenGL.GL, OpenGL.GLU, OpenGL.GLUT)
+
+# State setters whose arguments are remembered, so setting a value that
+# is already current is counted as redundant. Maps the function to the
+# number of leading arguments that select which piece of state it sets.
+TRACKED_STATE = {
+    'glBindTexture': 1,
+    'glBindBuffer': 1,
+    'glBindFramebuffer': 1,
+    'glUseProgram': 0,
+    'glColor3f': 0,
+    'glColor4f': 0,
+    'glMatrixMode': 0,
+    'glClearColor': 0,
+    'glAlphaFunc': 0,
+    'glListBase': 0,
+    'glPointSize': 0,
+}
+# Flip a capability on or off
+TOGGLES = {'glEnable': True, 'glDisable': False}
+# Always count as a state change; popping attributes also forgets what
+# the tracked state was
+UNTRACKED_STATE = {
+    'glPushAttrib',
+    'glPopAttrib',
+    'glTexParameteri',
+    'glViewport',
+    'glEnableClientState',
+    'glDisableClientState',
+}
+
+
+class _CountedCall:
+    def __init__(self, counter: 'GLCounter', name: str, func):
+        self.counter = counter
+        self.name = name
+        self.func = func
+
+    def __call__(self, *args):
+        self.counter.count(self.name, args)
+        return self.func(*args)
+
+    def __bool__(self):
+        # Keeps `if glGenFramebuffers` extension checks working
+        return bool(self.func)
+
+
+class GLCounter:
+    """
+    Debug wrapper around every PyOpenGL, GLU and GLUT function the soccer
+    modules import. It counts calls and state changes per frame and
+    attributes them to the FrameProfiler section that is running, so each
+    subsystem's share of the Python-to-GL traffic can be read off the HUD.
+    A state change is redundant when it sets a value that is already set.
+    """
+
+    def __init__(self, profiler: FrameProfiler):
+        self.profiler = profiler
+        self.calls = Counter()
+        self.changes = Counter()
+        self.redundant = Counter()
+        self.functions = Counter()
+        self.state = {}
+        self.frames = 0
+        self.last_frame: dict[str, tuple[int, int, int]] = {}
+        self.patched: list[tuple[object, str, object]] = []
+
+    def install(self):
+        originals = {
+            id(getattr(m, name)): name for m in GL_MODULES for name in dir(m)
+        }
+        wrappers = {}
+        for module_name, module in list(sys.modules.items()):
+            if not module_name.startswith('soccer.'):
+                continue
+            for attr, value in list(vars(module).items()):
+                name = originals.get(id(value))
+                if name is None or not attr.startswith('gl'):
+                    continue
+                wrapper = wrappers.get(name)
+                if wrapper is None:
+                    wrapper = wrappers[name] = _CountedCall(self, name, value)
+                self.patched.append((module, attr, value))
+                setattr(module, attr, wrapper)
+
+    def uninstall(self):
+        for module, attr, value in self.patched:
+            setattr(module, attr, value)
+        self.patched = []
+
+    def count(self, name: str, args: tuple):
+        section = self.profiler.current or 'other'
+        self.calls[section] += 1
+        self.functions[name] += 1
+
+        if name in TOGGLES:
+            key, value = ('enable', args[0]), TOGGLES[name]
+        elif name in TRACKED_STATE:
+            n = TRACKED_STATE[name]
+            key, value = (name, *args[:n]), args[n:]
+        elif name in UNTRACKED_STATE:
+            self.changes[section] += 1
+            if name == 'glPopAttrib':
+                self.state.clear()
+            return
+        else:
+            return
+
+        self.changes[section] += 1
+        if self.state.get(key, self) == value:
+            self.redundant[section] += 1
+        self.state[key] = value
+
+    def end_frame(self):
+        self.last_frame = {
+            section: (
+                self.calls[section],
+                self.changes[section],
+                self.redundant[section],
+            )
+            for section in self.calls
+        }
+        self.calls.clear()
+        self.changes.clear()
+        self.redundant.clear()
+        self.frames += 1
+
+    def report(self) -> str:
+        """
+        Average calls per frame of every GL function seen so far, most
+        called first.
+        """
+        frames = max(self.frames, 1)
+        lines = [f'GL calls per frame over {self.frames} frames:']
+        for name, n in self.functions.most_common():
+            lines.append(f'  {name:<28} {n / frames:10.1f}')
+        return '\n'.join(lines)
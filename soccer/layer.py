@@ -0,0 +1,182 @@
+from typing import Callable
+
+from OpenGL.GL import (
+    GL_ALPHA_TEST,
+    GL_CLAMP_TO_EDGE,
+    GL_COLOR_ATTACHMENT0,
+    GL_COLOR_BUFFER_BIT,
+    GL_ENABLE_BIT,
+    GL_FRAMEBUFFER,
+    GL_FRAMEBUFFER_COMPLETE,
+    GL_GREATER,
+    GL_MODELVIEW,
+    GL_NEAREST,
+    GL_PROJECTION,
+    GL_QUADS,
+    GL_RGBA,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MIN_FILTER,
+    GL_TEXTURE_WRAP_S,
+    GL_TEXTURE_WRAP_T,
+    GL_UNSIGNED_BYTE,
+    GL_VIEWPORT,
+    GL_VIEWPORT_BIT,
+    glAlphaFunc,
+    glBegin,
+    glBindFramebuffer,
+    glBindTexture,
+    glCheckFramebufferStatus,
+    glClear,
+    glClearColor,
+    glColor3f,
+    glDeleteFramebuffers,
+    glDeleteTextures,
+    glDisable,
+    glEnable,
+    glEnd,
+    glFramebufferTexture2D,
+    glGenFramebuffers,
+    glGenTextures,
+    glGetIntegerv,
+    glLoadIdentity,
+    glMatrixMode,
+    glPopAttrib,
+    glPopMatrix,
+    glPushAttrib,
+    glPushMatrix,
+    glTexCoord2f,
+    glTexImage2D,
+    glTexParameteri,
+    glVertex2f,
+    glViewport,
+)
+
+
+class CachedLayer:
+    """
+    Renders a static drawing once into an offscreen texture the size of the
+    viewport and, from then on, draws it as a single textured quad. The
+    drawing is redone only after invalidate() or a viewport resize. When
+    framebuffer objects are not available it just draws directly.
+    """
+
+    def __init__(self):
+        self.texture = None
+        self.framebuffer = None
+        self.size = None
+        self.dirty = True
+
+    def invalidate(self):
+        self.dirty = True
+
+    def draw(self, render: Callable[[], None]):
+        if not bool(glGenFramebuffers):
+            render()
+            return
+
+        _, _, width, height = glGetIntegerv(GL_VIEWPORT)
+        if self.size != (width, height):
+            self._allocate(width, height)
+        if self.framebuffer is None:
+            render()
+            return
+
+        if self.dirty:
+            self._render(render)
+            self.dirty = False
+        self._blit()
+
+    def release(self):
+        if self.framebuffer is not None:
+            glDeleteFramebuffers(1, [self.framebuffer])
+            glDeleteTextures([self.texture])
+        self.texture = None
+        self.framebuffer = None
+        self.size = None
+        self.dirty = True
+
+    def _allocate(self, width: int, height: int):
+        self.release()
+        self.size = (width, height)
+
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexImage2D(
+            GL_TEXTURE_2D,
+            0,
+            GL_RGBA,
+            width,
+            height,
+            0,
+            GL_RGBA,
+            GL_UNSIGNED_BYTE,
+            None,
+        )
+        # One texel per pixel, so nearest sampling reproduces the drawing
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0
+        )
+        complete = (
+            glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+        )
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+        self.texture = texture
+        self.framebuffer = framebuffer
+        if not complete:
+            self.release()
+            self.size = (width, height)
+
+    def _render(self, render: Callable[[], None]):
+        width, height = self.size
+        glPushAttrib(GL_COLOR_BUFFER_BIT | GL_VIEWPORT_BIT)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        glViewport(0, 0, width, height)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        render()
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glPopAttrib()
+
+    def _blit(self):
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+
+        # Texels are either fully covered or empty, so an alpha test keeps
+        # the copy exact where blending could be off by one
+        glEnable(GL_ALPHA_TEST)
+        glAlphaFunc(GL_GREATER, 0.5)
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glColor3f(1.0, 1.0, 1.0)
+
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, 0.0)
+        glVertex2f(-1.0, -1.0)
+        glTexCoord2f(1.0, 0.0)
+        glVertex2f(1.0, -1.0)
+        glTexCoord2f(1.0, 1.0)
+        glVertex2f(1.0, 1.0)
+        glTexCoord2f(0.0, 1.0)
+        glVertex2f(-1.0, 1.0)
+        glEnd()
+
+        glDisable(GL_TEXTURE_2D)
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
@@ -0,0 +1,148 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_ELEMENT_ARRAY_BUFFER,
+    GL_FLOAT,
+    GL_NORMAL_ARRAY,
+    GL_STATIC_DRAW,
+    GL_TEXTURE_COORD_ARRAY,
+    GL_TRIANGLES,
+    GL_UNSIGNED_INT,
+    GL_VERTEX_ARRAY,
+    glBindBuffer,
+    glBufferData,
+    glDisableClientState,
+    glDrawElements,
+    glEnableClientState,
+    glGenBuffers,
+    glNormalPointer,
+    glTexCoordPointer,
+    glVertexPointer,
+)
+
+# x, y, z, nx, ny, nz, s, t
+VERTEX_SIZE = 8
+STRIDE = VERTEX_SIZE * 4
+
+
+class SphereMesh:
+    """
+    Textured sphere with the same vertices, normals and texture coordinates
+    as gluSphere with texturing on, stored as an interleaved vertex array
+    plus triangle indices. The arrays are uploaded to VBOs on the first
+    draw and every later draw is a single glDrawElements call.
+    """
+
+    def __init__(self, radius: float, slices: int, stacks: int):
+        self.radius = radius
+        self.slices = slices
+        self.stacks = stacks
+        self.vertices, self.indices = self._build(radius, slices, stacks)
+        self.buffers = None
+
+    def draw(self):
+        if self.buffers is None and bool(glGenBuffers):
+            self._upload()
+
+        # Attribute pointers are offsets into the bound VBO, or addresses
+        # into the client-side array when VBOs are not available
+        if self.buffers:
+            vbo, ibo = self.buffers
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ibo)
+            base = 0
+            indices = None
+        else:
+            base = self.vertices.ctypes.data
+            indices = self.indices
+        vertices = ctypes.c_void_p(base)
+        normals = ctypes.c_void_p(base + 3 * 4)
+        uvs = ctypes.c_void_p(base + 6 * 4)
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3, GL_FLOAT, STRIDE, vertices)
+        glNormalPointer(GL_FLOAT, STRIDE, normals)
+        glTexCoordPointer(2, GL_FLOAT, STRIDE, uvs)
+        glDrawElements(
+            GL_TRIANGLES, self.indices.size, GL_UNSIGNED_INT, indices
+        )
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+        if self.buffers:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _upload(self):
+        vbo, ibo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(
+            GL_ARRAY_BUFFER,
+            self.vertices.nbytes,
+            self.vertices,
+            GL_STATIC_DRAW,
+        )
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ibo)
+        glBufferData(
+            GL_ELEMENT_ARRAY_BUFFER,
+            self.indices.nbytes,
+            self.indices,
+            GL_STATIC_DRAW,
+        )
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.buffers = (vbo, ibo)
+
+    @staticmethod
+    def _build(
+        radius: float, slices: int, stacks: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Rings go from +z (t = 1) to -z (t = 0); the last slice closes the
+        # seam at theta = 0 with s = 1, like the GLU quad strips
+        rho = np.arange(stacks + 1) * np.pi / stacks
+        theta = np.arange(slices + 1) * 2 * np.pi / slices
+        theta[-1] = 0.0
+        rho, theta = np.meshgrid(rho, theta, indexing='ij')
+
+        normals = np.stack(
+            [
+                -np.sin(theta) * np.sin(rho),
+                np.cos(theta) * np.sin(rho),
+                np.cos(rho),
+            ],
+            axis=-1,
+        )
+        s = np.arange(slices + 1) / slices
+        t = 1.0 - np.arange(stacks + 1) / stacks
+        uvs = np.stack(np.meshgrid(t, s, indexing='ij')[::-1], axis=-1)
+
+        vertices = np.concatenate([normals * radius, normals, uvs], axis=-1)
+        vertices = vertices.reshape(-1, VERTEX_SIZE).astype(np.float32)
+
+        # Each quad of a stack strip becomes two triangles, in strip order
+        # and split along the same diagonal as Mesa splits GL_QUAD_STRIP,
+        # since without depth testing the overlap order is visible
+        row = slices + 1
+        i, j = np.meshgrid(np.arange(stacks), np.arange(slices), indexing='ij')
+        top = i * row + j
+        bottom = top + row
+        indices = np.stack(
+            [top, bottom, bottom + 1, top, bottom + 1, top + 1], axis=-1
+        )
+        return vertices, indices.astype(np.uint32).ravel()
+
+
+_spheres: dict[tuple[float, int, int], SphereMesh] = {}
+
+
+def get_sphere(radius: float, slices: int, stacks: int) -> SphereMesh:
+    key = (radius, slices, stacks)
+    mesh = _spheres.get(key)
+    if mesh is None:
+        mesh = _spheres[key] = SphereMesh(radius, slices, stacks)
+    return mesh
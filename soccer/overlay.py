@@ -1,58 +1,37 @@
-import math
 import time
+from typing import Callable
 
-from OpenGL.GL import (
-    glColor3f,
-    glPopMatrix,
-    glPushMatrix,
-    glScalef,
-    glTranslatef,
-)
-from OpenGL.GLUT import (
-    GLUT_STROKE_ROMAN,
-    glutStrokeCharacter,
-)
+from soccer.text import draw_pulsing_text
 
 
 class TextOverlay:
-    def __init__(self):
+    DURATION = 150 / 60
+
+    def __init__(self, now: Callable[[], float] = time.time):
         self.show = False
         self.text = ''
+        self.now = now
         self.start_time = 0.0
-        self.timer = 0
 
     def show_text(self, text: str):
         self.text = text
         self.show = True
-        self.timer = 150
-        self.start_time = time.time()
+        self.start_time = self.now()
+
+    def elapsed(self) -> float | None:
+        """
+        Seconds the text has been up, or None if it is hidden. The text
+        hides itself once this has been returned past DURATION.
+        """
+        if not self.show:
+            return None
+
+        elapsed = self.now() - self.start_time
+        if elapsed >= self.DURATION:
+            self.show = False
+        return elapsed
 
     def draw(self):
-        if self.show:
-            elapsed = time.time() - self.start_time
-            glPushMatrix()
-            glTranslatef(-130, 0, 0)
-            glColor3f(1, 1, 0)
-
-            for i, c in enumerate(self.text):
-                char_elapsed = elapsed - (i * 0.1)
-                scale = 1.0 + 0.3 * math.sin(char_elapsed * 5)
-
-                glPushMatrix()
-                glTranslatef(i * 40, 0, 0)
-                glScalef(scale * 0.6, scale * 0.6, 1)
-
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        glPushMatrix()
-                        glTranslatef(dx * 1, dy * 1, 0)
-                        glutStrokeCharacter(GLUT_STROKE_ROMAN, ord(c))
-                        glPopMatrix()
-
-                glPopMatrix()
-
-            glPopMatrix()
-
-            self.timer -= 1
-            if self.timer <= 0:
-                self.show = False
+        elapsed = self.elapsed()
+        if elapsed is not None:
+            draw_pulsing_text(self.text, elapsed)
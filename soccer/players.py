@@ -1,13 +1,25 @@
+import ctypes
+import itertools
 from math import atan2, cos, pi, sin, sqrt
 from random import choice, randint, uniform
 
+import numpy as np
 from OpenGL.GL import (
+    GL_COLOR_ARRAY,
+    GL_FLOAT,
     GL_QUADS,
     GL_TRIANGLE_FAN,
+    GL_TRIANGLES,
+    GL_VERTEX_ARRAY,
     glBegin,
     glColor3f,
+    glColorPointer,
+    glDisableClientState,
+    glDrawArrays,
+    glEnableClientState,
     glEnd,
     glVertex2f,
+    glVertexPointer,
 )
 
 from soccer.collision import (
@@ -15,7 +27,10 @@ from soccer.collision import (
     Collidable,
     Collision,
     CollisionSystem,
+    aabb_collision_batch,
 )
+from soccer.render_queue import DrawItem, Layer, RenderQueue
+from soccer.tracing import traced
 
 SKIN_COLORS: list[tuple[float, float, float]] = [
     (0.631, 0.431, 0.294),
@@ -24,6 +39,15 @@ SKIN_COLORS: list[tuple[float, float, float]] = [
     (0.231, 0.133, 0.098),
 ]
 
+DEFENSE_POSITION_X = 1
+DEFENSE_POSITION_Y = 250
+CHANGE_ROUTE_PATTERN_PROB = 0.005
+THRESHOLD_DISTANCE_FOR_DEFENSE = 200
+
+HEAD_SEGMENTS = 20
+_angles = 2 * np.pi * np.arange(HEAD_SEGMENTS + 1) / HEAD_SEGMENTS
+UNIT_CIRCLE = np.stack([np.cos(_angles), np.sin(_angles)], axis=1)
+
 
 class Player(Collidable):
     position: tuple[float, float]
@@ -39,6 +63,7 @@ class Player(Collidable):
     ):
         self.initial_position = pos
         self.position = pos
+        self.previous_position = pos
         self.size = size
         self.team_color = team_color
         self.skin_color = choice(SKIN_COLORS)
@@ -46,6 +71,8 @@ class Player(Collidable):
         self.s1 = randint(-self.SPREAD_FACTOR, self.SPREAD_FACTOR)
         self.s2 = randint(-self.SPREAD_FACTOR, self.SPREAD_FACTOR)
         self.orientation = 0.0
+        self._bb = None
+        self._bb_position = None
 
     def draw(self):
         x, y = self.position
@@ -93,11 +120,6 @@ class Player(Collidable):
         if bx == 0 and by == 0:
             return
 
-        DEFENSE_POSITION_X = 1
-        DEFENSE_POSITION_Y = 250
-        CHANGE_ROUTE_PATTERN_PROB = 0.005
-        THRESHOLD_DISTANCE_FOR_DEFENSE = 200
-
         change_probability = uniform(0, 1)
         if change_probability < CHANGE_ROUTE_PATTERN_PROB:
             self.s1 = randint(-self.SPREAD_FACTOR, self.SPREAD_FACTOR)
@@ -123,24 +145,301 @@ class Player(Collidable):
             )
 
     def get_bounding_box(self) -> BoundingBox:
-        return BoundingBox(
-            x_min=self.position[0] - self.size // 2,
-            y_min=self.position[1] - self.size // 2,
-            x_max=self.position[0] + self.size // 2,
-            y_max=self.position[1] + self.size // 2,
-        )
+        # Positions are replaced, never mutated, so identity is enough
+        if self._bb_position is not self.position:
+            self._bb_position = self.position
+            self._bb = BoundingBox(
+                x_min=self.position[0] - self.size // 2,
+                y_min=self.position[1] - self.size // 2,
+                x_max=self.position[0] + self.size // 2,
+                y_max=self.position[1] + self.size // 2,
+            )
+        return self._bb
 
     def check_collision(self, bb: BoundingBox) -> Collision:
         if CollisionSystem.aabb_collision(bb, self.get_bounding_box()):
             return Collision.PLAYER
         return Collision.NONE
 
+    def check_collisions_batch(self, boxes: np.ndarray) -> np.ndarray:
+        bb = self.get_bounding_box()
+        own = np.array([[bb.x_min, bb.y_min, bb.x_max, bb.y_max]])
+        hit = aabb_collision_batch(boxes, own)[:, 0]
+        return np.where(hit, Collision.PLAYER.value, Collision.NONE.value)
+
     def reset_position(self):
         self.position = self.initial_position
         self.orientation = 0.0
 
+    def save_previous(self):
+        self.previous_position = self.position
+
 
 def get_n_players(
     positions: list[tuple[float, float]], **kwargs
 ) -> list[Player]:
     return [Player(pos, **kwargs) for pos in positions]
+
+
+class PlayerSwarm(Collidable):
+    """
+    Struct-of-arrays version of a list of Player objects. Positions, spread
+    offsets, orientations and colors live in NumPy arrays and update()
+    applies the chase/defend rule of Player.update to all of them at once.
+    """
+
+    SPREAD_FACTOR = 2
+
+    positions: np.ndarray
+    spread: np.ndarray
+    orientations: np.ndarray
+    team_colors: np.ndarray
+    skin_colors: np.ndarray
+
+    def __init__(
+        self,
+        positions: list[tuple[float, float]] | np.ndarray,
+        size: float = 10.0,
+        team_color: tuple[float, float, float] = (0.02, 0.584, 0.98),
+        seed: int | None = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.initial_positions = np.array(positions, dtype=np.float64)
+        self.positions = self.initial_positions.copy()
+        self.previous_positions = self.initial_positions.copy()
+        self.size = size
+        n = len(self.positions)
+        self.team_colors = np.tile(
+            np.array(team_color, dtype=np.float32), (n, 1)
+        )
+        skins = np.array(SKIN_COLORS, dtype=np.float32)
+        self.skin_colors = skins[self.rng.integers(len(skins), size=n)]
+        self.spread = self._random_spread(n)
+        self.orientations = np.zeros(n, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @classmethod
+    def from_players(
+        cls, players: list[Player], seed: int | None = None
+    ) -> 'PlayerSwarm':
+        swarm = cls(
+            [p.initial_position for p in players],
+            size=players[0].size if players else 10.0,
+            seed=seed,
+        )
+        if players:
+            swarm.positions[:] = [p.position for p in players]
+            swarm.spread[:] = [(p.s1, p.s2) for p in players]
+            swarm.orientations[:] = [p.orientation for p in players]
+            swarm.team_colors[:] = [p.team_color for p in players]
+            swarm.skin_colors[:] = [p.skin_color for p in players]
+        return swarm
+
+    def update(self, bx: float, by: float):
+        if bx == 0 and by == 0:
+            return
+
+        change = self.rng.random(len(self)) < CHANGE_ROUTE_PATTERN_PROB
+        if change.any():
+            self.spread[change] = self._random_spread(int(change.sum()))
+
+        delta = np.array([bx, by]) - self.positions
+        self.orientations = -np.arctan2(delta[:, 0], delta[:, 1])
+
+        d = np.hypot(delta[:, 0], delta[:, 1])
+        defense = np.array([DEFENSE_POSITION_X, DEFENSE_POSITION_Y])
+        step = np.where(
+            (d > THRESHOLD_DISTANCE_FOR_DEFENSE)[:, None],
+            0.03 * (defense - self.positions),
+            0.02 * delta,
+        )
+        self.positions += self.spread + step
+
+    def get_bounding_boxes(self) -> np.ndarray:
+        half = self.size // 2
+        return np.concatenate(
+            [self.positions - half, self.positions + half], axis=1
+        )
+
+    def get_bounding_box(self) -> BoundingBox:
+        half = self.size // 2
+        x_min, y_min = self.positions.min(axis=0) - half
+        x_max, y_max = self.positions.max(axis=0) + half
+        return BoundingBox(x_min, y_min, x_max, y_max)
+
+    def check_collision(self, bb: BoundingBox) -> Collision:
+        box = np.array([[bb.x_min, bb.y_min, bb.x_max, bb.y_max]])
+        if aabb_collision_batch(box, self.get_bounding_boxes()).any():
+            return Collision.PLAYER
+        return Collision.NONE
+
+    def check_collisions_batch(
+        self, boxes: np.ndarray, chunk_size: int = 1 << 22
+    ) -> np.ndarray:
+        own = self.get_bounding_boxes()
+        hit = np.zeros(len(boxes), dtype=bool)
+        rows = max(1, chunk_size // max(1, len(own)))
+        for start in range(0, len(boxes), rows):
+            chunk = slice(start, start + rows)
+            hit[chunk] = aabb_collision_batch(boxes[chunk], own).any(axis=1)
+        return np.where(hit, Collision.PLAYER.value, Collision.NONE.value)
+
+    def reset_position(self):
+        self.positions[:] = self.initial_positions
+        self.orientations[:] = 0.0
+
+    def save_previous(self):
+        self.previous_positions[:] = self.positions
+
+    def _random_spread(self, n: int) -> np.ndarray:
+        return self.rng.integers(
+            -self.SPREAD_FACTOR, self.SPREAD_FACTOR + 1, size=(n, 2)
+        ).astype(np.float64)
+
+
+class PlayerRenderer:
+    """
+    Draws any number of players with one glDrawArrays call. Shoulders and
+    heads are written as triangles into a single interleaved x, y, r, g, b
+    buffer, player by player, so overlaps look the same as calling
+    Player.draw on each of them in turn.
+    """
+
+    # Two shoulder triangles plus one head triangle per segment
+    VERTICES_PER_PLAYER = 6 + 3 * HEAD_SEGMENTS
+
+    def __init__(self):
+        self.buffer = np.empty((0, 5), dtype=np.float32)
+
+    @traced('PlayerRenderer.draw')
+    def draw(self, players: list, alpha: float = 1.0):
+        """
+        Draws a list of Player and/or PlayerSwarm objects, such as
+        Simulation.players, `alpha` of the way from their previous
+        positions to the current ones.
+        """
+        arrays = self.gather(players, alpha)
+        if not len(arrays[0]):
+            return
+        vertices = self.build_vertices(*arrays)
+
+        pointer = vertices.ctypes.data
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 5 * 4, ctypes.c_void_p(pointer))
+        glColorPointer(3, GL_FLOAT, 5 * 4, ctypes.c_void_p(pointer + 2 * 4))
+        glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def submit(self, queue: RenderQueue, players: list, alpha: float = 1.0):
+        """
+        Queues the same triangles draw() would draw.
+        """
+        arrays = self.gather(players, alpha)
+        if not len(arrays[0]):
+            return
+        vertices = self.build_vertices(*arrays)
+        queue.submit(
+            DrawItem(
+                Layer.PLAYERS, GL_TRIANGLES, vertices[:, :2], vertices[:, 2:]
+            )
+        )
+
+    def build_vertices(
+        self,
+        positions: np.ndarray,
+        orientations: np.ndarray,
+        sizes: np.ndarray,
+        team_colors: np.ndarray,
+        skin_colors: np.ndarray,
+    ) -> np.ndarray:
+        n = len(positions)
+        size = n * self.VERTICES_PER_PLAYER
+        if len(self.buffer) < size:
+            self.buffer = np.empty((size, 5), dtype=np.float32)
+        vertices = self.buffer[:size].reshape(n, self.VERTICES_PER_PLAYER, 5)
+
+        # Player shoulders
+        direction = np.stack([np.cos(orientations), np.sin(orientations)], 1)
+        perpendicular = direction[:, ::-1] * np.array([-1.0, 1.0])
+        along = direction * sizes[:, None]
+        across = perpendicular * (0.35 * sizes[:, None])
+        corners = np.stack(
+            [
+                positions + along + across,
+                positions + along - across,
+                positions - along - across,
+                positions - along + across,
+            ],
+            axis=1,
+        )
+        vertices[:, :6, :2] = corners[:, [0, 1, 2, 0, 2, 3]]
+        vertices[:, :6, 2:] = team_colors[:, None]
+
+        # Players head
+        rim = positions[:, None] + UNIT_CIRCLE * (sizes[:, None, None] / 2)
+        head = vertices[:, 6:].reshape(n, HEAD_SEGMENTS, 3, 5)
+        head[:, :, 0, :2] = positions[:, None]
+        head[:, :, 1, :2] = rim[:, :-1]
+        head[:, :, 2, :2] = rim[:, 1:]
+        head[..., 2:] = skin_colors[:, None, None]
+
+        return self.buffer[:size]
+
+    @staticmethod
+    def gather(players: list, alpha: float) -> tuple[np.ndarray, ...]:
+        """
+        Positions (interpolated by alpha), orientations, sizes, team and
+        skin colors of all players as arrays, in drawing order.
+        """
+        positions = []
+        orientations = []
+        sizes = []
+        team_colors = []
+        skin_colors = []
+        # Runs of single players are gathered together, swarms as they
+        # come, so overlaps are the same as drawing them one by one
+        for is_swarm, run in itertools.groupby(
+            players, key=lambda p: isinstance(p, PlayerSwarm)
+        ):
+            if not is_swarm:
+                singles = list(run)
+                current = np.array([p.position for p in singles])
+                previous = np.array([p.previous_position for p in singles])
+                positions.append(previous * (1 - alpha) + current * alpha)
+                orientations.append([p.orientation for p in singles])
+                sizes.append([float(p.size) for p in singles])
+                team_colors.append([p.team_color for p in singles])
+                skin_colors.append([p.skin_color for p in singles])
+                continue
+            for swarm in run:
+                positions.append(
+                    swarm.previous_positions * (1 - alpha)
+                    + swarm.positions * alpha
+                )
+                orientations.append(swarm.orientations)
+                sizes.append(np.full(len(swarm), swarm.size, dtype=np.float64))
+                team_colors.append(swarm.team_colors)
+                skin_colors.append(swarm.skin_colors)
+        if not positions:
+            return (
+                np.empty((0, 2)),
+                np.empty(0),
+                np.empty(0),
+                np.empty((0, 3)),
+                np.empty((0, 3)),
+            )
+
+        return tuple(
+            np.concatenate(arrays)
+            for arrays in (
+                positions,
+                orientations,
+                sizes,
+                team_colors,
+                skin_colors,
+            )
+        )
@@ -0,0 +1,182 @@
+import functools
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+from OpenGL.GL import glColor3f
+from OpenGL.GLUT import GLUT_BITMAP_9_BY_15
+
+from soccer.text import draw_bitmap_text
+
+if TYPE_CHECKING:
+    from soccer.glstats import GLCounter
+
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """
+    The last `capacity` samples of an int64 series, kept in a preallocated
+    array that is overwritten oldest first.
+    """
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity, dtype=np.int64)
+        self.index = 0
+        self.count = 0
+
+    def add(self, value: int):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def values(self) -> np.ndarray:
+        return self.data[: self.count]
+
+
+class _Section:
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+        self.outer = None
+
+    def __enter__(self):
+        self.outer = self.profiler.current
+        self.profiler.current = self.name
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        self.profiler.current = self.outer
+
+
+class FrameProfiler:
+    """
+    Times named sections of a frame with perf_counter_ns. A section can run
+    several times per frame (collision queries run once per simulation
+    step); its times are summed and end_frame() stores the frame's total in
+    that section's ring buffer. Draw sections measure the time to submit
+    the GL calls, the GPU work shows up in the buffer swap.
+    """
+
+    def __init__(self, capacity: int = 600):
+        self.capacity = capacity
+        self.buffers: dict[str, RingBuffer] = {}
+        self.pending: dict[str, int] = {}
+        self.sections: dict[str, _Section] = {}
+        # Innermost section running right now
+        self.current: str | None = None
+
+    def section(self, name: str) -> _Section:
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+            self.buffers[name] = RingBuffer(self.capacity)
+            self.pending[name] = 0
+        return section
+
+    def add(self, name: str, ns: int):
+        self.pending[name] += ns
+
+    def instrument(self, obj, method: str, name: str):
+        """
+        Wraps obj.method so every call is timed as section `name`.
+        """
+        section = self.section(name)
+        original = getattr(obj, method)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with section:
+                return original(*args, **kwargs)
+
+        setattr(obj, method, timed)
+
+    def end_frame(self):
+        for name, ns in self.pending.items():
+            self.buffers[name].add(ns)
+            self.pending[name] = 0
+
+    def percentiles(self, name: str) -> np.ndarray:
+        """
+        p50, p95 and p99 of a section, in milliseconds.
+        """
+        values = self.buffers[name].values()
+        if not len(values):
+            return np.zeros(len(PERCENTILES))
+        return np.percentile(values, PERCENTILES) / 1e6
+
+
+class ProfilerHUD:
+    """
+    Table of the profiler's percentiles drawn over the game. The numbers
+    are recomputed every `refresh` frames so the HUD does not cost more
+    than what it measures. Sections of a `simulation` profiler, timed on
+    the simulation thread, are listed under the frame's.
+    """
+
+    LINE_HEIGHT = 18
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        gl: 'GLCounter | None' = None,
+        position: tuple[float, float] = (-30, 370),
+        refresh: int = 30,
+        simulation: FrameProfiler | None = None,
+    ):
+        self.profiler = profiler
+        self.gl = gl
+        self.simulation = simulation
+        self.position = position
+        self.refresh = refresh
+        self.visible = False
+        self.frames = 0
+        self.lines: list[str] = []
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames = 0
+
+    def update(self) -> list[str]:
+        """
+        Lines to show this frame, none while the HUD is hidden.
+        """
+        if not self.visible:
+            return []
+
+        if self.frames % self.refresh == 0:
+            self.lines = self._format()
+        self.frames += 1
+        return self.lines
+
+    def draw(self):
+        x, y = self.position
+        glColor3f(1, 1, 1)
+        for i, line in enumerate(self.update()):
+            draw_bitmap_text(
+                x, y - self.LINE_HEIGHT * i, line, GLUT_BITMAP_9_BY_15
+            )
+
+    def _format(self) -> list[str]:
+        header = 'section       p50    p95    p99 ms'
+        if self.gl:
+            header += '  calls state redundant'
+        lines = [header]
+        for name in self.profiler.buffers:
+            p50, p95, p99 = self.profiler.percentiles(name)
+            line = f'{name:<10} {p50:6.2f} {p95:6.2f} {p99:6.2f}'
+            if self.gl:
+                calls, changes, redundant = self.gl.last_frame.get(
+                    name, (0, 0, 0)
+                )
+                line += f'    {calls:6d} {changes:5d} {redundant:9d}'
+            lines.append(line)
+        # No GL calls happen there, so no GL columns either
+        if self.simulation:
+            lines.append('simulation thread')
+            for name in self.simulation.buffers:
+                p50, p95, p99 = self.simulation.percentiles(name)
+                lines.append(f'{name:<10} {p50:6.2f} {p95:6.2f} {p99:6.2f}')
+        return lines
@@ -0,0 +1,238 @@
+import ctypes
+import math
+from dataclasses import dataclass
+from enum import IntEnum
+from itertools import groupby
+from typing import Callable
+
+import numpy as np
+from OpenGL.GL import (
+    GL_C3F_V3F,
+    GL_COLOR_ARRAY,
+    GL_T2F_C3F_V3F,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_COORD_ARRAY,
+    GL_UNSIGNED_INT,
+    GL_VERTEX_ARRAY,
+    glBindTexture,
+    glDisable,
+    glDisableClientState,
+    glDrawArrays,
+    glDrawElements,
+    glEnable,
+    glInterleavedArrays,
+    glLineWidth,
+)
+
+WHITE = (1.0, 1.0, 1.0)
+
+
+class Layer(IntEnum):
+    """
+    Drawing order of a frame. Items of a lower layer are always drawn
+    before those of a higher one, but items of the same layer are grouped
+    by state, so anything that has to cover something else goes in a
+    higher layer than it.
+    """
+
+    FIELD = 0
+    MARKINGS = 1
+    BALL = 2
+    PLAYERS = 3
+    PANELS = 4
+    OUTLINES = 5
+    TEXT = 6
+
+
+def rotation(angle: float, axis: tuple[float, float, float]) -> np.ndarray:
+    """
+    The matrix glRotatef(angle, *axis) multiplies by.
+    """
+    x, y, z = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    c = math.cos(math.radians(angle))
+    s = math.sin(math.radians(angle))
+    t = 1 - c
+    return np.array([
+        [x * x * t + c, x * y * t - z * s, x * z * t + y * s, 0],
+        [y * x * t + z * s, y * y * t + c, y * z * t - x * s, 0],
+        [x * z * t - y * s, y * z * t + x * s, z * z * t + c, 0],
+        [0, 0, 0, 1],
+    ])
+
+
+@dataclass(slots=True)
+class DrawItem:
+    """
+    Geometry submitted to a RenderQueue. `primitive` must be one that can
+    be concatenated (GL_TRIANGLES, GL_LINES or GL_POINTS). `colors` is an
+    (n, 3) array or one color for every vertex, and `transform` a 4x4
+    matrix applied to the (n, 2) or (n, 3) vertices before they are
+    merged, in place of a glPushMatrix/glPopMatrix pair. With `indices`
+    the primitives are made of those vertices, as in glDrawElements.
+    """
+
+    layer: Layer
+    primitive: int
+    vertices: np.ndarray
+    colors: np.ndarray | tuple[float, float, float] = WHITE
+    texture: int = 0
+    texcoords: np.ndarray | None = None
+    transform: np.ndarray | None = None
+    line_width: float = 1.0
+    indices: np.ndarray | None = None
+
+    def key(self) -> tuple:
+        return (
+            self.layer,
+            0,
+            self.texture,
+            self.primitive,
+            self.line_width,
+        )
+
+    def write_positions(self, out: np.ndarray):
+        """
+        Writes the vertices, transformed, into the (n, 3) `out`.
+        """
+        dimensions = self.vertices.shape[1]
+        if self.transform is None:
+            out[:, :dimensions] = self.vertices
+            out[:, dimensions:] = 0.0
+        else:
+            matrix = self.transform[:3, :dimensions]
+            out[:] = self.vertices @ matrix.T + self.transform[:3, 3]
+
+
+@dataclass(slots=True)
+class _Call:
+    """
+    Drawing the queue cannot express as vertex arrays, like the GLUT
+    text. It runs after the layer's geometry, in submission order.
+    """
+
+    layer: Layer
+    draw: Callable[[], None]
+
+    def key(self) -> tuple:
+        return (self.layer, 1, 0, 0, 0.0)
+
+
+class RenderQueue:
+    """
+    Collects a frame's draw items and draws them on flush(), sorted by
+    layer and then by texture, primitive and line width, so each of those
+    is set once per frame rather than once per entity. Consecutive items
+    with the same state are concatenated into one glDrawArrays call; the
+    sort is stable, so they keep the order they were submitted in.
+    """
+
+    def __init__(self):
+        self.items: list[DrawItem | _Call] = []
+        # Interleaved s, t, r, g, b, x, y, z vertices, grown as needed
+        self.buffer = np.empty(0, dtype=np.float32)
+        # What flush() last set, so it only touches state that changes
+        self.arrays = False
+        self.texture = 0
+        self.line_width = 1.0
+
+    def submit(self, item: DrawItem):
+        if len(item.vertices):
+            self.items.append(item)
+
+    def call(self, layer: Layer, draw: Callable[[], None]):
+        self.items.append(_Call(layer, draw))
+
+    def flush(self):
+        items = sorted(self.items, key=_key)
+        self.items = []
+
+        for (_, is_call, texture, primitive, line_width), group in groupby(
+            items, key=_key
+        ):
+            if is_call:
+                # Calls expect the state the entities' draw() methods do
+                self._set_state(0, 1.0)
+                self._disable_arrays()
+                for call in group:
+                    call.draw()
+            else:
+                self._set_state(texture, line_width)
+                self._draw(primitive, texture, list(group))
+        self._set_state(0, 1.0)
+        self._disable_arrays()
+
+    def _set_state(self, texture: int, line_width: float):
+        if texture != self.texture:
+            if not self.texture:
+                glEnable(GL_TEXTURE_2D)
+            if texture:
+                glBindTexture(GL_TEXTURE_2D, texture)
+            else:
+                glDisable(GL_TEXTURE_2D)
+            self.texture = texture
+        if line_width != self.line_width:
+            glLineWidth(line_width)
+            self.line_width = line_width
+
+    def _disable_arrays(self):
+        # glInterleavedArrays enables the arrays of its format by itself
+        if self.arrays:
+            for array in (
+                GL_VERTEX_ARRAY,
+                GL_COLOR_ARRAY,
+                GL_TEXTURE_COORD_ARRAY,
+            ):
+                glDisableClientState(array)
+            self.arrays = False
+
+    def _draw(self, primitive: int, texture: int, items: list[DrawItem]):
+        n = sum(len(item.vertices) for item in items)
+        if texture:
+            layout, width = GL_T2F_C3F_V3F, 8
+        else:
+            layout, width = GL_C3F_V3F, 6
+        if len(self.buffer) < n * width:
+            self.buffer = np.empty(n * width, dtype=np.float32)
+        vertices = self.buffer[: n * width].reshape(n, width)
+
+        start = 0
+        for item in items:
+            end = start + len(item.vertices)
+            if texture:
+                vertices[start:end, :2] = item.texcoords
+            vertices[start:end, -6:-3] = item.colors
+            item.write_positions(vertices[start:end, -3:])
+            start = end
+
+        glInterleavedArrays(layout, 0, ctypes.c_void_p(vertices.ctypes.data))
+        self.arrays = True
+        if all(item.indices is None for item in items):
+            glDrawArrays(primitive, 0, n)
+            return
+
+        # Each item's indices are shifted past the vertices before it
+        offsets = np.cumsum(
+            [0] + [len(item.vertices) for item in items], dtype=np.uint32
+        )
+        indices = np.concatenate(
+            [
+                (
+                    np.arange(len(item.vertices), dtype=np.uint32)
+                    if item.indices is None
+                    else item.indices
+                )
+                + offset
+                for item, offset in zip(items, offsets)
+            ],
+            dtype=np.uint32,
+        )
+        glDrawElements(
+            primitive,
+            len(indices),
+            GL_UNSIGNED_INT,
+            ctypes.c_void_p(indices.ctypes.data),
+        )
+
+
+def _key(item: DrawItem | _Call) -> tuple:
+    return item.key()
@@ -0,0 +1,68 @@
+from OpenGL.GL import GL_COLOR_BUFFER_BIT, glClear, glClearColor
+
+from soccer.ball import Ball
+from soccer.button import Button
+from soccer.field import Field
+from soccer.overlay import TextOverlay
+from soccer.players import PlayerRenderer
+from soccer.profiler import ProfilerHUD
+from soccer.render_queue import Layer, RenderQueue
+from soccer.score import Score
+from soccer.shader_renderer import ShaderRenderer
+
+RENDERERS = ('legacy', 'shader')
+
+
+class LegacyRenderer:
+    """
+    The fixed-function renderer. Entities submit their geometry to a
+    RenderQueue, which draws the whole frame in end_frame() with as few
+    state changes and draw calls as it can; GLUT text and the cached field
+    are queued as calls.
+    """
+
+    def __init__(self):
+        self.player_renderer = PlayerRenderer()
+        self.queue = RenderQueue()
+
+    @staticmethod
+    def begin_frame():
+        glClear(GL_COLOR_BUFFER_BIT)
+        glClearColor(0.0, 0.65, 0.075, 1)
+
+    def draw_field(self, field: Field):
+        self.queue.call(Layer.FIELD, field.draw)
+
+    def draw_ball(self, ball: Ball, alpha: float = 1.0):
+        ball.submit(self.queue, alpha)
+
+    def draw_score(self, score: Score):
+        self.queue.call(Layer.TEXT, score.draw)
+        self.queue.call(Layer.TEXT, score.draw_goal_text)
+
+    def draw_players(self, players: list, alpha: float = 1.0):
+        self.player_renderer.submit(self.queue, players, alpha)
+
+    def draw_button(self, button: Button):
+        button.submit(self.queue)
+
+    def draw_overlay(self, overlay: TextOverlay):
+        self.queue.call(Layer.TEXT, overlay.draw)
+
+    def draw_hud(self, hud: ProfilerHUD):
+        self.queue.call(Layer.TEXT, hud.draw)
+
+    def end_frame(self):
+        self.queue.flush()
+
+
+def create_renderer(name: str):
+    """
+    Builds the renderer called `name`. The shader one needs a core
+    profile context, see Game.
+    """
+    if name == 'legacy':
+        return LegacyRenderer()
+    if name == 'shader':
+        return ShaderRenderer()
+    raise ValueError(f'unknown renderer {name!r}, expected one of {RENDERERS}')
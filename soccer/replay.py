@@ -0,0 +1,230 @@
+import hashlib
+import struct
+from dataclasses import dataclass, field
+from functools import cache
+
+import numpy as np
+import pygame
+
+from soccer.players import PlayerSwarm
+from soccer.simulation import KeyState, Simulation
+
+MAGIC = b'CGFR'
+VERSION = 1
+
+# Every input a tick can consume, as one bit of a byte
+KEY_BITS = (
+    (pygame.K_LEFT, 1 << 0),
+    (pygame.K_RIGHT, 1 << 1),
+    (pygame.K_UP, 1 << 2),
+    (pygame.K_DOWN, 1 << 3),
+    (pygame.K_e, 1 << 4),
+)
+RESET_BIT = 1 << 7
+
+# magic, version, seed, size factor, player size, vectorized, players
+HEADER = struct.Struct('<4sHqHd?H')
+POSITION = struct.Struct('<dd')
+# A run of ticks with the same input: mask and length
+RUN = struct.Struct('<BH')
+COUNT = struct.Struct('<I')
+MAX_RUN = 0xFFFF
+DIGEST_SIZE = 16
+
+
+class ReplayError(Exception):
+    pass
+
+
+def encode_keys(keys) -> int:
+    mask = 0
+    for key, bit in KEY_BITS:
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+@cache
+def decode_keys(mask: int) -> KeyState:
+    return KeyState(key for key, bit in KEY_BITS if mask & bit)
+
+
+def state_digest(simulation: Simulation) -> bytes:
+    """
+    Short hash of everything a replay has to reproduce: tick count, score,
+    ball and player positions.
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(
+        struct.pack(
+            '<qii',
+            simulation.clock.ticks,
+            simulation.score.scoreA,
+            simulation.score.scoreB,
+        )
+    )
+    digest.update(np.asarray(simulation.ball.position, np.float64).tobytes())
+    for player in simulation.players:
+        positions = (
+            player.positions
+            if isinstance(player, PlayerSwarm)
+            else player.position
+        )
+        digest.update(np.asarray(positions, np.float64).tobytes())
+    return digest.digest()
+
+
+@dataclass
+class InputLog:
+    """
+    Everything needed to rerun a match: the simulation parameters, the RNG
+    seed and the input of every tick, stored run-length encoded since keys
+    are held for many ticks at a time. The digest of the final state is
+    kept so a replay can check it ended up in the same place.
+    """
+
+    seed: int
+    size_factor: int
+    player_size: float
+    formation: list[tuple[float, float]]
+    vectorized: bool = False
+    runs: list[tuple[int, int]] = field(default_factory=list)
+    digest: bytes = bytes(DIGEST_SIZE)
+
+    @classmethod
+    def for_simulation(cls, simulation: Simulation) -> 'InputLog':
+        if simulation.seed is None:
+            raise ReplayError('only seeded simulations can be recorded')
+        return cls(
+            seed=simulation.seed,
+            size_factor=simulation.size_factor,
+            player_size=simulation.player_size,
+            formation=list(simulation.formation),
+            vectorized=simulation.vectorized,
+        )
+
+    @property
+    def ticks(self) -> int:
+        return sum(count for _, count in self.runs)
+
+    def append(self, mask: int):
+        if self.runs and self.runs[-1][0] == mask:
+            count = self.runs[-1][1]
+            if count < MAX_RUN:
+                self.runs[-1] = (mask, count + 1)
+                return
+        self.runs.append((mask, 1))
+
+    def masks(self):
+        for mask, count in self.runs:
+            for _ in range(count):
+                yield mask
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.seed,
+                    self.size_factor,
+                    self.player_size,
+                    self.vectorized,
+                    len(self.formation),
+                )
+            )
+            for position in self.formation:
+                f.write(POSITION.pack(*position))
+            f.write(COUNT.pack(len(self.runs)))
+            for run in self.runs:
+                f.write(RUN.pack(*run))
+            f.write(self.digest)
+
+    @classmethod
+    def load(cls, path: str) -> 'InputLog':
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[: len(MAGIC)] != MAGIC:
+            raise ReplayError(f'{path} is not an input log')
+
+        reader = _Reader(path, data)
+        _, version, seed, size_factor, player_size, vectorized, n = (
+            reader.read(HEADER)[0]
+        )
+        if version != VERSION:
+            raise ReplayError(f'{path} has unsupported version {version}')
+        formation = reader.read(POSITION, n)
+        (n_runs,) = reader.read(COUNT)[0]
+        runs = reader.read(RUN, n_runs)
+        digest = reader.take(DIGEST_SIZE)
+
+        return cls(
+            seed=seed,
+            size_factor=size_factor,
+            player_size=player_size,
+            formation=formation,
+            vectorized=vectorized,
+            runs=runs,
+            digest=digest,
+        )
+
+
+class _Reader:
+    def __init__(self, path: str, data: bytes):
+        self.path = path
+        self.data = data
+        self.offset = 0
+
+    def take(self, size: int) -> bytes:
+        chunk = self.data[self.offset : self.offset + size]
+        if len(chunk) != size:
+            raise ReplayError(f'{self.path} is truncated')
+        self.offset += size
+        return chunk
+
+    def read(self, item: struct.Struct, count: int = 1) -> list[tuple]:
+        return list(item.iter_unpack(self.take(count * item.size)))
+
+
+class InputRecorder:
+    """
+    Hooked into a Simulation, logs the input of every step it runs.
+    """
+
+    def __init__(self, log: InputLog):
+        self.log = log
+
+    def record(self, keys, reset: bool):
+        mask = encode_keys(keys)
+        if reset:
+            mask |= RESET_BIT
+        self.log.append(mask)
+
+    def save(self, path: str, simulation: Simulation):
+        self.log.digest = state_digest(simulation)
+        self.log.save(path)
+
+
+def replay(log: InputLog, verify: bool = True) -> Simulation:
+    """
+    Feeds a recorded log through a new headless simulation as fast as it
+    can step and returns it in its final state. With verify, raises
+    ReplayError if that state differs from the recorded one.
+    """
+    simulation = Simulation(
+        size_factor=log.size_factor,
+        formation=log.formation,
+        player_size=log.player_size,
+        seed=log.seed,
+        vectorized=log.vectorized,
+    )
+    for mask in log.masks():
+        if mask & RESET_BIT:
+            simulation.request_reset()
+        simulation.step(decode_keys(mask))
+
+    if verify and state_digest(simulation) != log.digest:
+        raise ReplayError(
+            f'replay diverged from the recording after {log.ticks} ticks'
+        )
+    return simulation
@@ -1,37 +1,37 @@
-import math
 import time
+from typing import Callable
 
-import pygame
-from OpenGL.GL import (
-    glColor3f,
-    glPopMatrix,
-    glPushMatrix,
-    glRasterPos2f,
-    glScalef,
-    glTranslatef,
-)
-from OpenGL.GLUT import (
-    GLUT_BITMAP_HELVETICA_18,
-    GLUT_STROKE_ROMAN,
-    glutBitmapCharacter,
-    glutStrokeCharacter,
-)
+from OpenGL.GL import glColor3f
+
+from soccer.audio import Sound
+from soccer.text import draw_bitmap_text, draw_pulsing_text
+
+GOAL_SOUND = 'soccer/assets/galva-gol.mp3'
 
 
 class Score:
+    GOAL_TEXT = 'GOOOOAL!'
+    GOAL_TEXT_DURATION = 250 / 60
+
     scoreA: int
     scoreB: int
-    goal_start_time: int
-    goal_timer: int
+    goal_start_time: float
     show_goal_text: bool
 
-    def __init__(self):
+    def __init__(
+        self,
+        load_sfx: bool = True,
+        now: Callable[[], float] = time.time,
+    ):
         self.scoreA = 0
         self.scoreB = 0
-        self.goal_timer = 0
-        self.goal_start_timer = 0
+        self.now = now
+        self.goal_start_time = 0.0
         self.show_goal_text = False
-        self.gol_sfx = pygame.mixer.Sound('soccer/assets/galva-gol.mp3')
+        self.gol_sfx = None
+        if load_sfx:
+            self.gol_sfx = Sound(GOAL_SOUND)
+            self.gol_sfx.load_async()
 
     def add_points(self, team):
         if team == 'A':
@@ -39,56 +39,41 @@ class Score:
         elif team == 'B':
             self.scoreB += 1
 
-    def draw(self):
-        string = (
+    def label(self) -> str:
+        return (
             'Team A   '
             + str(self.scoreA)
             + '   |   Team B   '
             + str(self.scoreB)
         )
-        string = string.encode()
 
+    def draw(self):
         glColor3f(1, 1, 1)
-        glRasterPos2f(-500, 320)
-        for c in string:
-            glutBitmapCharacter(GLUT_BITMAP_HELVETICA_18, c)
+        draw_bitmap_text(-500, 320, self.label())
 
     def on_goal(self):
         self.show_goal_text = True
-        self.goal_timer = 250
-        self.goal_start_time = time.time()
-        self.gol_sfx.play()
+        self.goal_start_time = self.now()
+        if self.gol_sfx:
+            self.gol_sfx.play()
+
+    def goal_text_elapsed(self) -> float | None:
+        """
+        Seconds the goal banner has been up, or None if it is hidden. The
+        banner hides itself once this has been returned past its duration.
+        """
+        if not self.show_goal_text:
+            return None
+
+        elapsed = self.now() - self.goal_start_time
+        if elapsed >= self.GOAL_TEXT_DURATION:
+            self.show_goal_text = False
+        return elapsed
 
     def draw_goal_text(self):
-        if self.show_goal_text:
-            elapsed = time.time() - self.goal_start_time
-            text = 'GOOOOAL!'
-            glPushMatrix()
-            glTranslatef(-130, 0, 0)
-            glColor3f(1, 1, 0)
-
-            for i, c in enumerate(text):
-                char_elapsed = elapsed - (i * 0.1)
-                scale = 1.0 + 0.3 * math.sin(char_elapsed * 5)
-
-                glPushMatrix()
-                glTranslatef(i * 40, 0, 0)
-                glScalef(scale * 0.6, scale * 0.6, 1)
-
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        glPushMatrix()
-                        glTranslatef(dx * 1, dy * 1, 0)
-                        glutStrokeCharacter(GLUT_STROKE_ROMAN, ord(c))
-                        glPopMatrix()
-
-                glPopMatrix()
-
-            glPopMatrix()
-
-            self.goal_timer -= 1
-            if self.goal_timer <= 0:
-                self.show_goal_text = False
+        elapsed = self.goal_text_elapsed()
+        if elapsed is not None:
+            draw_pulsing_text(self.GOAL_TEXT, elapsed)
 
     def reset_score(self):
         self.scoreA = 0
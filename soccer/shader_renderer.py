@@ -0,0 +1,747 @@
+import ctypes
+
+import numpy as np
+import pygame
+from OpenGL.GL import (
+    GL_ARRAY_BUFFER,
+    GL_BLEND,
+    GL_CLAMP_TO_EDGE,
+    GL_COLOR_ATTACHMENT0,
+    GL_COLOR_BUFFER_BIT,
+    GL_DYNAMIC_DRAW,
+    GL_ELEMENT_ARRAY_BUFFER,
+    GL_FALSE,
+    GL_FLOAT,
+    GL_FRAMEBUFFER,
+    GL_LINEAR,
+    GL_NEAREST,
+    GL_ONE_MINUS_SRC_ALPHA,
+    GL_POINTS,
+    GL_RGBA,
+    GL_SRC_ALPHA,
+    GL_STATIC_DRAW,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MIN_FILTER,
+    GL_TEXTURE_WRAP_S,
+    GL_TEXTURE_WRAP_T,
+    GL_TRIANGLES,
+    GL_TRUE,
+    GL_UNSIGNED_BYTE,
+    GL_UNSIGNED_INT,
+    GL_VIEWPORT,
+    glBindBuffer,
+    glBindFramebuffer,
+    glBindTexture,
+    glBindVertexArray,
+    glBlendFunc,
+    glBufferData,
+    glClear,
+    glClearColor,
+    glDeleteBuffers,
+    glDeleteFramebuffers,
+    glDeleteTextures,
+    glDeleteVertexArrays,
+    glDrawArrays,
+    glDrawArraysInstanced,
+    glEnable,
+    glEnableVertexAttribArray,
+    glFramebufferTexture2D,
+    glGenBuffers,
+    glGenFramebuffers,
+    glGenTextures,
+    glGenVertexArrays,
+    glGetIntegerv,
+    glTexImage2D,
+    glTexParameteri,
+    glUniform4f,
+    glUseProgram,
+    glVertexAttribDivisor,
+    glVertexAttribPointer,
+    glViewport,
+)
+
+# Raw entry points for the per-frame calls that take arrays: they pass a
+# pointer as is, where the wrappers convert and check it on every call
+from OpenGL.raw.GL.VERSION.GL_1_1 import glDrawElements
+from OpenGL.raw.GL.VERSION.GL_1_5 import glBufferSubData
+from OpenGL.raw.GL.VERSION.GL_2_0 import glUniformMatrix4fv
+
+from soccer import shaders
+from soccer.ball import Ball
+from soccer.button import Button
+from soccer.field import Field
+from soccer.mesh import STRIDE as MESH_STRIDE
+from soccer.mesh import get_sphere
+from soccer.overlay import TextOverlay
+from soccer.players import HEAD_SEGMENTS, UNIT_CIRCLE, PlayerRenderer
+from soccer.profiler import ProfilerHUD
+from soccer.render_queue import rotation
+from soccer.score import Score
+
+FLOAT_SIZE = 4
+# x, y, width, height, u0, v0, u1, v1, r, g, b, a
+QUAD_SIZE = 12
+# Quads are drawn as indexed triangle pairs with the quad repeated on each
+# corner, not instanced: llvmpipe runs its whole vertex pipeline once per
+# instance, which made a frame of text cost several times more
+QUAD_CORNERS = np.array([(0, 0), (1, 0), (0, 1), (1, 1)], dtype=np.float32)
+QUAD_INDICES = np.array([0, 1, 2, 1, 2, 3], dtype=np.uint32)
+# Corner x, y, then the quad
+QUAD_VERTEX_SIZE = 2 + QUAD_SIZE
+# x, y, orientation, size, team r, g, b, skin r, g, b
+PLAYER_SIZE = 10
+
+WHITE = (1.0, 1.0, 1.0, 1.0)
+YELLOW = (1.0, 1.0, 0.0, 1.0)
+# Clear color of the screen, under the field
+GRASS = (0.0, 0.65, 0.075, 1.0)
+# Printable Latin-1 characters, like the GLUT fonts
+CHARACTERS = [chr(c) for c in [*range(32, 127), *range(160, 256)]]
+
+
+def ortho(
+    x_range: tuple[float, float],
+    y_range: tuple[float, float],
+    z_range: tuple[float, float],
+) -> np.ndarray:
+    """
+    The matrix glOrtho multiplies by.
+    """
+    (left, right), (bottom, top), (near, far) = x_range, y_range, z_range
+    return np.array(
+        [
+            [2 / (right - left), 0, 0, -(right + left) / (right - left)],
+            [0, 2 / (top - bottom), 0, -(top + bottom) / (top - bottom)],
+            [0, 0, -2 / (far - near), -(far + near) / (far - near)],
+            [0, 0, 0, 1],
+        ],
+        dtype=np.float32,
+    )
+
+
+def _attribute(
+    location: int,
+    size: int,
+    stride: int,
+    offset: int,
+    divisor: int = 0,
+):
+    glEnableVertexAttribArray(location)
+    glVertexAttribPointer(
+        location,
+        size,
+        GL_FLOAT,
+        GL_FALSE,
+        stride,
+        ctypes.c_void_p(offset * FLOAT_SIZE),
+    )
+    if divisor:
+        glVertexAttribDivisor(location, divisor)
+
+
+def _texture(pixels: bytes, width: int, height: int, filtering: int) -> int:
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexImage2D(
+        GL_TEXTURE_2D,
+        0,
+        GL_RGBA,
+        width,
+        height,
+        0,
+        GL_RGBA,
+        GL_UNSIGNED_BYTE,
+        pixels,
+    )
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, filtering)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, filtering)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+    return texture
+
+
+class Font:
+    """
+    Sizes and atlas coordinates of the glyphs of one font in a FontAtlas.
+    layout() turns a string into quads, one per visible character, with
+    the position on the baseline like glRasterPos.
+    """
+
+    def __init__(self, descent: int, glyphs: dict[str, tuple]):
+        self.descent = descent
+        self.glyphs = glyphs
+
+    def layout(
+        self,
+        text: str,
+        position: tuple[float, float],
+        color: tuple = WHITE,
+        *,
+        scale: float = 1.0,
+        advance: float | None = None,
+    ) -> np.ndarray:
+        quads = []
+        x, y = position
+        pen = x
+        bottom = y + self.descent * scale
+        for c in text:
+            w, h, u0, v0, u1, v1 = self.glyphs.get(c, self.glyphs['?'])
+            # Blank glyphs only move the pen
+            if not c.isspace():
+                quads.append((
+                    pen,
+                    bottom,
+                    w * scale,
+                    h * scale,
+                    u0,
+                    v0,
+                    u1,
+                    v1,
+                    *color,
+                ))
+            pen += advance if advance is not None else w * scale
+        return np.array(quads, dtype=np.float32).reshape(-1, QUAD_SIZE)
+
+
+class FontAtlas:
+    """
+    Glyphs of several pygame fonts, given as (size, bold) pairs,
+    rasterized once into one texture, so all the text of a frame can be
+    one draw call. A white block in the corner lets solid rectangles
+    share the texture, so the button is drawn along with the text.
+    """
+
+    WIDTH = 1024
+    PADDING = 2
+
+    def __init__(self, specs: list[tuple[int, bool]]):
+        rendered = []
+        for size, bold in specs:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+            # Some code points (soft hyphen) have no glyph at all
+            characters = [c for c in CHARACTERS if font.size(c)[0]]
+            glyphs = [
+                font.render(c, True, (255, 255, 255)) for c in characters
+            ]
+            rendered.append((font, characters, glyphs))
+
+        # Shelf packing, one row of glyphs after the other
+        x, y, row = 4 + self.PADDING, 0, 4
+        boxes = []
+        for _, _, glyphs in rendered:
+            for glyph in glyphs:
+                if x + glyph.get_width() > self.WIDTH:
+                    x, y, row = 0, y + row + self.PADDING, 0
+                boxes.append((x, y))
+                x += glyph.get_width() + self.PADDING
+                row = max(row, glyph.get_height())
+        atlas_height = 1 << (y + row).bit_length()
+
+        surface = pygame.Surface((self.WIDTH, atlas_height), pygame.SRCALPHA)
+        surface.fill((255, 255, 255, 255), (0, 0, 4, 4))
+        placed = iter(boxes)
+        self.fonts = []
+        for font, characters, glyphs in rendered:
+            table = {}
+            for c, glyph in zip(characters, glyphs):
+                gx, gy = next(placed)
+                surface.blit(glyph, (gx, gy))
+                w, h = glyph.get_size()
+                # Texture rows run bottom up
+                table[c] = (
+                    w,
+                    h,
+                    gx / self.WIDTH,
+                    1 - (gy + h) / atlas_height,
+                    (gx + w) / self.WIDTH,
+                    1 - gy / atlas_height,
+                )
+            self.fonts.append(Font(font.get_descent(), table))
+        self.texture = _texture(
+            pygame.image.tostring(surface, 'RGBA', True),
+            self.WIDTH,
+            atlas_height,
+            GL_LINEAR,
+        )
+        self.white_uv = (
+            1 / self.WIDTH,
+            1 - 3 / atlas_height,
+            3 / self.WIDTH,
+            1 - 1 / atlas_height,
+        )
+
+    def rect(
+        self, x: float, y: float, w: float, h: float, color: tuple
+    ) -> np.ndarray:
+        return np.array(
+            [(x, y, w, h, *self.white_uv, *color)], dtype=np.float32
+        )
+
+
+class StreamBuffer:
+    """
+    A vertex buffer rewritten every frame. Data goes in with
+    glBufferSubData, and the storage is only reallocated when the data
+    outgrows it, so a frame does not create a new buffer per draw.
+    """
+
+    def __init__(self):
+        self.id = glGenBuffers(1)
+        self.capacity = 0
+
+    def upload(self, data: np.ndarray):
+        glBindBuffer(GL_ARRAY_BUFFER, self.id)
+        if data.nbytes > self.capacity:
+            self.capacity = max(data.nbytes, 2 * self.capacity)
+            glBufferData(GL_ARRAY_BUFFER, self.capacity, None, GL_DYNAMIC_DRAW)
+        glBufferSubData(
+            GL_ARRAY_BUFFER,
+            0,
+            data.nbytes,
+            ctypes.c_void_p(data.ctypes.data),
+        )
+
+
+class ShaderRenderer:
+    """
+    Core profile renderer. Geometry that never changes (the pitch, the
+    ball mesh, the player shape, the glyph atlas) lives in VAOs built the
+    first time it is drawn; a frame only uploads the projection-free
+    per-frame data: the ball's model matrix, one instance per player and
+    the quads of the text and button on screen. Those quads are collected
+    by the draw_* calls and drawn in one call by end_frame(), above
+    everything else, like the legacy renderer's TEXT layer. Needs OpenGL
+    3.3, which Mesa's llvmpipe provides.
+    """
+
+    BANNER_SCALE = 1.0
+    TEXT_CACHE_SIZE = 256
+
+    def __init__(self):
+        projection = ortho((-500, 500), (-400, 400), (-1000, 1000))
+        self.quad_program = shaders.Program(
+            shaders.QUAD_VERTEX, shaders.QUAD_FRAGMENT, ['projection']
+        )
+        self.flat_program = shaders.Program(
+            shaders.FLAT_VERTEX, shaders.FLAT_FRAGMENT, ['projection', 'color']
+        )
+        self.mesh_program = shaders.Program(
+            shaders.MESH_VERTEX,
+            shaders.MESH_FRAGMENT,
+            ['projection', 'model'],
+        )
+        self.player_program = shaders.Program(
+            shaders.PLAYER_VERTEX, shaders.PLAYER_FRAGMENT, ['projection']
+        )
+        for program in (
+            self.quad_program,
+            self.flat_program,
+            self.mesh_program,
+            self.player_program,
+        ):
+            glUseProgram(program.id)
+            glUniformMatrix4fv(
+                program.uniforms['projection'],
+                1,
+                GL_TRUE,
+                projection.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+            )
+        glUseProgram(0)
+        # The window cannot be resized, so the viewport is read only once
+        self.viewport = tuple(glGetIntegerv(GL_VIEWPORT))
+
+        self.white = _texture(b'\xff' * 4, 1, 1, GL_NEAREST)
+        self.atlas = FontAtlas([(20, False), (28, False), (96, True)])
+        self.small_font, self.medium_font, self.banner_font = self.atlas.fonts
+        self.text_cache = {}
+        # Button quads by button state
+        self.button_cache = {}
+        # Quads the draw_* calls queued for end_frame()
+        self.overlay_quads: list[np.ndarray] = []
+
+        # Indices of as many quads as have been drawn at once, shared by
+        # every quad VAO
+        self.quad_indices = glGenBuffers(1)
+        self.quad_capacity = 0
+        self.quad_buffer = StreamBuffer()
+        self.quads = self._quad_batch(self.quad_buffer.id)
+        self.quad_vertices = np.empty((0, QUAD_VERTEX_SIZE), dtype=np.float32)
+        screen_quad = self._quad_vertices(
+            np.array(
+                [(-500, -400, 1000, 800, 0.0, 0.0, 1.0, 1.0, *WHITE)],
+                dtype=np.float32,
+            )
+        ).copy()
+        screen_buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, screen_buffer)
+        glBufferData(
+            GL_ARRAY_BUFFER, screen_quad.nbytes, screen_quad, GL_STATIC_DRAW
+        )
+        self.screen = self._quad_batch(screen_buffer)
+        self._reserve_quads(256)
+        self.player_buffer = StreamBuffer()
+        self.players = self._player_batch(self.player_buffer.id)
+        self.player_instances = np.empty((0, PLAYER_SIZE), dtype=np.float32)
+        self.field_layer = None
+        self.field_key = None
+        self.balls = {}
+        self.ball_model = np.empty((4, 4), dtype=np.float32)
+        self.ball_pointer = self.ball_model.ctypes.data_as(
+            ctypes.POINTER(ctypes.c_float)
+        )
+        self.ball_angle = None
+        # Glyph quads of each banner text at scale 1 and the slot of each
+        # glyph in the text, pulsed every frame
+        self.banners = {}
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glClearColor(*GRASS)
+
+    @staticmethod
+    def begin_frame():
+        glClear(GL_COLOR_BUFFER_BIT)
+
+    def draw_field(self, field: Field):
+        # Nothing in the field moves, so like Field.layer it is drawn once
+        # into a texture the size of the viewport and blitted from then on
+        _, _, width, height = self.viewport
+        key = (field.size_factor, field.texture, width, height)
+        if self.field_key != key:
+            self._render_field(field, width, height)
+            self.field_key = key
+        glUseProgram(self.quad_program.id)
+        glBindTexture(GL_TEXTURE_2D, self.field_layer[0])
+        glBindVertexArray(self.screen)
+        glDrawElements(GL_TRIANGLES, len(QUAD_INDICES), GL_UNSIGNED_INT, None)
+
+    def draw_ball(self, ball: Ball, alpha: float = 1.0):
+        slices, stacks = Ball.LEVELS_OF_DETAIL[ball.lod]
+        key = (ball.radius, slices, stacks)
+        if key not in self.balls:
+            self.balls[key] = self._ball_batch(get_sphere(*key))
+        vao, n_indices = self.balls[key]
+
+        # The ball only turns while it moves, so the rotation is reused
+        model = self.ball_model
+        if self.ball_angle != ball.rot_angle:
+            model[:] = rotation(ball.rot_angle, (1.0, 1.0, 1.0))
+            self.ball_angle = ball.rot_angle
+        (px, py), (x, y) = ball.previous_position, ball.position
+        model[0, 3] = px + (x - px) * alpha
+        model[1, 3] = py + (y - py) * alpha
+
+        glUseProgram(self.mesh_program.id)
+        glUniformMatrix4fv(
+            self.mesh_program.uniforms['model'], 1, GL_TRUE, self.ball_pointer
+        )
+        glBindTexture(GL_TEXTURE_2D, ball.texture or self.white)
+        glBindVertexArray(vao)
+        glDrawElements(GL_TRIANGLES, n_indices, GL_UNSIGNED_INT, None)
+
+    def draw_players(self, players: list, alpha: float = 1.0):
+        positions, orientations, sizes, team_colors, skin_colors = (
+            PlayerRenderer.gather(players, alpha)
+        )
+        n = len(positions)
+        if not n:
+            return
+        if len(self.player_instances) < n:
+            self.player_instances = np.empty(
+                (n, PLAYER_SIZE), dtype=np.float32
+            )
+        instances = self.player_instances[:n]
+        instances[:, 0:2] = positions
+        instances[:, 2] = orientations
+        instances[:, 3] = sizes
+        instances[:, 4:7] = team_colors
+        instances[:, 7:10] = skin_colors
+
+        glUseProgram(self.player_program.id)
+        self.player_buffer.upload(instances)
+        glBindVertexArray(self.players[0])
+        glDrawArraysInstanced(GL_TRIANGLES, 0, self.players[1], n)
+
+    def draw_score(self, score: Score):
+        self.overlay_quads.append(
+            self._text(self.medium_font, score.label(), (-500, 320))
+        )
+        elapsed = score.goal_text_elapsed()
+        if elapsed is not None:
+            self._queue_banner(Score.GOAL_TEXT, elapsed)
+
+    def draw_button(self, button: Button):
+        x, y = button.position
+        w, h = button.width, button.height
+        key = (x, y, w, h, button.text, button.is_hovered)
+        quads = self.button_cache.get(key)
+        if quads is None:
+            quads = self.button_cache[key] = self._button_quads(button)
+        self.overlay_quads.append(quads)
+
+    def draw_overlay(self, overlay: TextOverlay):
+        elapsed = overlay.elapsed()
+        if elapsed is not None:
+            self._queue_banner(overlay.text, elapsed)
+
+    def draw_hud(self, hud: ProfilerHUD):
+        x, y = hud.position
+        for i, line in enumerate(hud.update()):
+            self.overlay_quads.append(
+                self._text(
+                    self.small_font,
+                    line,
+                    (x, y - hud.LINE_HEIGHT * i),
+                    advance=9,
+                )
+            )
+
+    def end_frame(self):
+        if self.overlay_quads:
+            quads = np.concatenate(self.overlay_quads)
+            self.overlay_quads.clear()
+            self._draw_quads(quads, self.atlas.texture)
+
+    def _button_quads(self, button: Button) -> np.ndarray:
+        x, y = button.position
+        w, h = button.width, button.height
+        color = button.hover_color if button.is_hovered else button.color
+        border = (0.2, 0.2, 0.2, 1.0)
+        rect = self.atlas.rect
+        label = self.small_font.layout(
+            button.text,
+            (x + w / 2 - len(button.text) * 4.5, y + h / 2 - 5),
+            (*button.text_color, 1.0),
+        )
+        # A 2 pixel wide outline, centered on the edges like glLineWidth
+        return np.concatenate([
+            rect(x, y, w, h, (*color, 1.0)),
+            rect(x - 1, y - 1, w + 2, 2, border),
+            rect(x - 1, y + h - 1, w + 2, 2, border),
+            rect(x - 1, y - 1, 2, h + 2, border),
+            rect(x + w - 1, y - 1, 2, h + 2, border),
+            label,
+        ])
+
+    def _queue_banner(self, text: str, elapsed: float):
+        # Same placement and pulse as draw_pulsing_text, every character
+        # scaled about its own origin
+        banner = self.banners.get(text)
+        if banner is None:
+            # Blank characters have no quad but still take their slot
+            banner = self.banners[text] = (
+                self.banner_font.layout(text, (0, 0), YELLOW, advance=0),
+                np.array(
+                    [i for i, c in enumerate(text) if not c.isspace()],
+                    dtype=np.float32,
+                ),
+            )
+        base, index = banner
+        scale = self.BANNER_SCALE * (
+            1.0 + 0.3 * np.sin((elapsed - index * 0.1) * 5)
+        )
+        quads = base.copy()
+        quads[:, 0] = -130 + index * 40
+        quads[:, 1:4] *= scale[:, None]
+        self.overlay_quads.append(quads)
+
+    def _text(
+        self,
+        font: Font,
+        text: str,
+        position: tuple[float, float],
+        color: tuple = WHITE,
+        **kw,
+    ) -> np.ndarray:
+        """
+        font.layout() for text that stays the same from frame to frame.
+        """
+        key = (id(font), text, position, color, *kw.items())
+        quads = self.text_cache.get(key)
+        if quads is None:
+            if len(self.text_cache) >= self.TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            quads = font.layout(text, position, color, **kw)
+            self.text_cache[key] = quads
+        return quads
+
+    def _draw_quads(self, quads: np.ndarray, texture: int):
+        glUseProgram(self.quad_program.id)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        self._reserve_quads(len(quads))
+        self.quad_buffer.upload(self._quad_vertices(quads))
+        glBindVertexArray(self.quads)
+        glDrawElements(
+            GL_TRIANGLES,
+            len(quads) * len(QUAD_INDICES),
+            GL_UNSIGNED_INT,
+            None,
+        )
+
+    def _reserve_quads(self, n: int):
+        if n <= self.quad_capacity:
+            return
+        self.quad_capacity = max(n, 2 * self.quad_capacity)
+        offsets = len(QUAD_CORNERS) * np.arange(
+            self.quad_capacity, dtype=np.uint32
+        )
+        indices = (offsets[:, None] + QUAD_INDICES).ravel()
+        # Through the array target, as the element one belongs to a VAO
+        glBindBuffer(GL_ARRAY_BUFFER, self.quad_indices)
+        glBufferData(GL_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+
+    def _quad_vertices(self, quads: np.ndarray) -> np.ndarray:
+        n = len(quads) * len(QUAD_CORNERS)
+        if len(self.quad_vertices) < n:
+            self.quad_vertices = np.empty(
+                (n, QUAD_VERTEX_SIZE), dtype=np.float32
+            )
+        vertices = self.quad_vertices[:n].reshape(
+            len(quads), -1, QUAD_VERTEX_SIZE
+        )
+        vertices[:, :, :2] = QUAD_CORNERS
+        vertices[:, :, 2:] = quads[:, None]
+        return self.quad_vertices[:n]
+
+    def _quad_batch(self, vertices: int) -> int:
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.quad_indices)
+        stride = QUAD_VERTEX_SIZE * FLOAT_SIZE
+        glBindBuffer(GL_ARRAY_BUFFER, vertices)
+        _attribute(0, 2, stride, 0)
+        _attribute(1, 4, stride, 2)
+        _attribute(2, 4, stride, 6)
+        _attribute(3, 4, stride, 10)
+        glBindVertexArray(0)
+        return vao
+
+    @staticmethod
+    def _player_batch(instances: int) -> tuple[int, int]:
+        # Unit player, in the order PlayerRenderer.build_vertices uses:
+        # shoulders along the orientation, then the head fan
+        shoulders = np.array(
+            [(1, 0.35), (1, -0.35), (-1, -0.35), (-1, 0.35)], dtype=np.float32
+        )[[0, 1, 2, 0, 2, 3]]
+        rim = UNIT_CIRCLE * 0.5
+        head = np.zeros((HEAD_SEGMENTS, 3, 2), dtype=np.float32)
+        head[:, 1] = rim[:-1]
+        head[:, 2] = rim[1:]
+        local = np.concatenate([shoulders, head.reshape(-1, 2)])
+        part = np.repeat([0.0, 1.0], [len(shoulders), 3 * HEAD_SEGMENTS])
+        mesh = np.column_stack([local, part]).astype(np.float32)
+
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        vertices = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vertices)
+        glBufferData(GL_ARRAY_BUFFER, mesh.nbytes, mesh, GL_STATIC_DRAW)
+        _attribute(0, 2, 3 * FLOAT_SIZE, 0)
+        _attribute(1, 1, 3 * FLOAT_SIZE, 2)
+
+        stride = PLAYER_SIZE * FLOAT_SIZE
+        glBindBuffer(GL_ARRAY_BUFFER, instances)
+        _attribute(2, 4, stride, 0, divisor=1)
+        _attribute(3, 3, stride, 4, divisor=1)
+        _attribute(4, 3, stride, 7, divisor=1)
+        glBindVertexArray(0)
+        return vao, len(mesh)
+
+    def _render_field(self, field: Field, width: int, height: int):
+        if self.field_layer:
+            texture, framebuffer = self.field_layer
+            glDeleteFramebuffers(1, [framebuffer])
+            glDeleteTextures([texture])
+        texture = _texture(None, width, height, GL_NEAREST)
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferTexture2D(
+            GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0
+        )
+        self.field_layer = (texture, framebuffer)
+
+        glViewport(0, 0, width, height)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+        grass = np.array(
+            [
+                (
+                    -field.width / 2,
+                    -field.length / 2,
+                    field.width,
+                    field.length,
+                    0.0,
+                    0.0,
+                    5.0,
+                    5.0,
+                    *WHITE,
+                )
+            ],
+            dtype=np.float32,
+        )
+        self._draw_quads(grass, field.texture or self.white)
+
+        # Pitch line points followed by the triangles of the three marks
+        points = field.line_points()
+        angles = 2.0 * np.pi * np.arange(101) / 100
+        rim = 5 * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        marks = []
+        for y in (
+            0,
+            -3 * field.small_area_length,
+            3 * field.small_area_length,
+        ):
+            center = np.array([0.0, y])
+            fan = np.empty((100, 3, 2))
+            fan[:, 0] = center
+            fan[:, 1] = center + rim[:-1]
+            fan[:, 2] = center + rim[1:]
+            marks.append(fan.reshape(-1, 2))
+        vertices = np.concatenate([points, *marks]).astype(np.float32)
+
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, buffer)
+        glBufferData(
+            GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW
+        )
+        _attribute(0, 2, 2 * FLOAT_SIZE, 0)
+
+        glUseProgram(self.flat_program.id)
+        glUniform4f(self.flat_program.uniforms['color'], *WHITE)
+        glDrawArrays(GL_POINTS, 0, len(points))
+        glDrawArrays(GL_TRIANGLES, len(points), len(vertices) - len(points))
+
+        glBindVertexArray(0)
+        glDeleteVertexArrays(1, [vao])
+        glDeleteBuffers(1, [buffer])
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glClearColor(*GRASS)
+
+    @staticmethod
+    def _ball_batch(mesh) -> tuple[int, int]:
+        vao = glGenVertexArrays(1)
+        glBindVertexArray(vao)
+        vertices, indices = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, vertices)
+        glBufferData(
+            GL_ARRAY_BUFFER,
+            mesh.vertices.nbytes,
+            mesh.vertices,
+            GL_STATIC_DRAW,
+        )
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, indices)
+        glBufferData(
+            GL_ELEMENT_ARRAY_BUFFER,
+            mesh.indices.nbytes,
+            mesh.indices,
+            GL_STATIC_DRAW,
+        )
+        _attribute(0, 3, MESH_STRIDE, 0)
+        _attribute(2, 2, MESH_STRIDE, 6)
+        glBindVertexArray(0)
+        return vao, mesh.indices.size
@@ -0,0 +1,161 @@
+from OpenGL.GL import (
+    GL_COMPILE_STATUS,
+    GL_FRAGMENT_SHADER,
+    GL_LINK_STATUS,
+    GL_VERTEX_SHADER,
+    glAttachShader,
+    glCompileShader,
+    glCreateProgram,
+    glCreateShader,
+    glDeleteShader,
+    glGetProgramInfoLog,
+    glGetProgramiv,
+    glGetShaderInfoLog,
+    glGetShaderiv,
+    glGetUniformLocation,
+    glLinkProgram,
+    glShaderSource,
+)
+
+# Quads: text glyphs, the button and the grass. Every vertex carries its
+# corner of the unit square and the whole rectangle, with its own texture
+# coordinates and color.
+QUAD_VERTEX = """
+#version 330 core
+uniform mat4 projection;
+layout(location = 0) in vec2 corner;
+layout(location = 1) in vec4 rect;
+layout(location = 2) in vec4 uv_rect;
+layout(location = 3) in vec4 color;
+out vec2 uv;
+out vec4 tint;
+void main() {
+    uv = mix(uv_rect.xy, uv_rect.zw, corner);
+    tint = color;
+    gl_Position = projection * vec4(rect.xy + corner * rect.zw, 0.0, 1.0);
+}
+"""
+
+QUAD_FRAGMENT = """
+#version 330 core
+uniform sampler2D image;
+in vec2 uv;
+in vec4 tint;
+out vec4 frag_color;
+void main() {
+    frag_color = texture(image, uv) * tint;
+}
+"""
+
+# Untextured 2D geometry in a single color: the pitch lines and marks
+FLAT_VERTEX = """
+#version 330 core
+uniform mat4 projection;
+layout(location = 0) in vec2 position;
+void main() {
+    gl_Position = projection * vec4(position, 0.0, 1.0);
+}
+"""
+
+FLAT_FRAGMENT = """
+#version 330 core
+uniform vec4 color;
+out vec4 frag_color;
+void main() {
+    frag_color = color;
+}
+"""
+
+# The textured ball; the model matrix is the only per-frame input
+MESH_VERTEX = """
+#version 330 core
+uniform mat4 projection;
+uniform mat4 model;
+layout(location = 0) in vec3 position;
+layout(location = 2) in vec2 texcoord;
+out vec2 uv;
+void main() {
+    uv = texcoord;
+    gl_Position = projection * model * vec4(position, 1.0);
+}
+"""
+
+MESH_FRAGMENT = """
+#version 330 core
+uniform sampler2D image;
+in vec2 uv;
+out vec4 frag_color;
+void main() {
+    frag_color = texture(image, uv);
+}
+"""
+
+# Players, one instance each. The shoulders turn with the orientation,
+# the head is a circle and is placed as is, like Player.draw does.
+PLAYER_VERTEX = """
+#version 330 core
+uniform mat4 projection;
+layout(location = 0) in vec2 local;
+layout(location = 1) in float part;
+layout(location = 2) in vec4 placement;
+layout(location = 3) in vec3 team_color;
+layout(location = 4) in vec3 skin_color;
+out vec3 color;
+void main() {
+    vec2 position = placement.xy;
+    float angle = placement.z;
+    float size = placement.w;
+    vec2 along = vec2(cos(angle), sin(angle));
+    vec2 across = vec2(-along.y, along.x);
+    vec2 offset = part < 0.5 ? local.x * along + local.y * across : local;
+    color = part < 0.5 ? team_color : skin_color;
+    gl_Position = projection * vec4(position + offset * size, 0.0, 1.0);
+}
+"""
+
+PLAYER_FRAGMENT = """
+#version 330 core
+in vec3 color;
+out vec4 frag_color;
+void main() {
+    frag_color = vec4(color, 1.0);
+}
+"""
+
+
+class ShaderError(RuntimeError):
+    pass
+
+
+class Program:
+    """
+    A linked vertex + fragment shader pair with its uniform locations
+    looked up once.
+    """
+
+    def __init__(self, vertex: str, fragment: str, uniforms: list[str]):
+        self.id = glCreateProgram()
+        shaders = [
+            _compile(GL_VERTEX_SHADER, vertex),
+            _compile(GL_FRAGMENT_SHADER, fragment),
+        ]
+        for shader in shaders:
+            glAttachShader(self.id, shader)
+        glLinkProgram(self.id)
+        for shader in shaders:
+            glDeleteShader(shader)
+        if not glGetProgramiv(self.id, GL_LINK_STATUS):
+            raise ShaderError(glGetProgramInfoLog(self.id).decode())
+
+        self.uniforms = {
+            name: glGetUniformLocation(self.id, name) for name in uniforms
+        }
+
+
+def _compile(kind: int, source: str) -> int:
+    shader = glCreateShader(kind)
+    glShaderSource(shader, source.strip())
+    glCompileShader(shader)
+    if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+        raise ShaderError(glGetShaderInfoLog(shader).decode())
+    return shader
@@ -0,0 +1,250 @@
+import random
+from collections import Counter
+from typing import Callable, Iterable
+
+import pygame
+
+from soccer.ball import Ball
+from soccer.clock import SimulationClock
+from soccer.collision import Collision, CollisionSystem
+from soccer.field import Field
+from soccer.overlay import TextOverlay
+from soccer.players import PlayerSwarm, get_n_players
+from soccer.score import Score
+from soccer.tracing import traced
+
+DEFAULT_FORMATION: list[tuple[float, float]] = [
+    (85.0, 70.0),
+    (-85.0, 70.0),
+    (180.0, 150.0),
+    (0.0, 150.0),
+    (-180.0, 150.0),
+    (85.0, 240.0),
+    (0.0, 240.0),
+    (-85.0, 240.0),
+]
+
+
+class KeyState:
+    """
+    Scripted stand-in for pygame.key.get_pressed(). Indexing it with a
+    pygame key constant tells whether that key is held down.
+    """
+
+    def __init__(self, pressed: Iterable[int] = ()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+    def __repr__(self):
+        names = [pygame.key.name(k) for k in sorted(self.pressed)]
+        return f'KeyState({", ".join(names)})'
+
+
+NO_KEYS = KeyState()
+
+
+class RandomController:
+    """
+    Programmatic input that keeps a random arrow-key combination held for
+    a random number of ticks, roughly like a player wandering with the
+    ball. It owns its RNG so it does not disturb the players' randomness.
+    """
+
+    def __init__(
+        self, seed: int | None = None, min_hold: int = 10, max_hold: int = 60
+    ):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.keys = NO_KEYS
+        self.hold = 0
+
+    def __call__(self, simulation: 'Simulation') -> KeyState:
+        if self.hold <= 0:
+            horizontal = self.rng.choice([
+                (),
+                (pygame.K_LEFT,),
+                (pygame.K_RIGHT,),
+            ])
+            vertical = self.rng.choice([(), (pygame.K_UP,), (pygame.K_DOWN,)])
+            self.keys = KeyState(horizontal + vertical)
+            self.hold = self.rng.randint(self.min_hold, self.max_hold)
+        self.hold -= 1
+        return self.keys
+
+
+class Simulation:
+    """
+    Game logic without a window: field, ball, players, collisions, score
+    and pauses. Each call to step() is one 60 Hz tick of the game, and
+    every timer is measured on the simulation clock, never on the wall.
+    """
+
+    TICK_RATE = 60
+    PLAYERS_PER_CELL = 4
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        size_factor: int = 6,
+        formation: list[tuple[float, float]] = DEFAULT_FORMATION,
+        player_size: float = 14.0,
+        headless: bool = True,
+        seed: int | None = None,
+        vectorized: bool = False,
+        time_scale: float = 1.0,
+    ):
+        if seed is not None:
+            random.seed(seed)
+
+        self.seed = seed
+        self.size_factor = size_factor
+        self.formation = formation
+        self.player_size = player_size
+        self.vectorized = vectorized
+        self.recorder = None
+        self.state_recorder = None
+        # Requests only ever count up, from whichever thread handles
+        # input; step() alone moves resets_handled up to them, so a
+        # request made while a step runs is kept for the next one
+        self.reset_requests = 0
+        self.resets_handled = 0
+        self.clock = SimulationClock(
+            step=1 / self.TICK_RATE, time_scale=time_scale
+        )
+        self.pause_until = 0
+        self.interpolate = not headless
+        self.events = Counter()
+        if headless:
+            self.field = Field(size_factor=size_factor, texture_path=None)
+            self.ball = Ball(
+                field=self.field, texture_path=None, verbose=False
+            )
+        else:
+            self.field = Field(size_factor=size_factor)
+            self.ball = Ball(field=self.field)
+        # A PlayerSwarm quacks like a single Player, so the vectorized
+        # engine is just a one-element list of players
+        if vectorized:
+            self.players = [
+                PlayerSwarm(formation, size=player_size, seed=seed)
+            ]
+        else:
+            self.players = get_n_players(positions=formation, size=player_size)
+        self.collision_system = CollisionSystem(
+            cell_size=self.PLAYERS_PER_CELL * player_size
+        )
+        self.collision_system.add_collidable(self.field)
+        for player in self.players:
+            self.collision_system.add_collidable(
+                player, indexed=not vectorized
+            )
+        self.score = Score(load_sfx=not headless, now=self.clock.now)
+        self.overlay = TextOverlay(now=self.clock.now)
+
+    @property
+    def paused(self) -> bool:
+        return self.clock.ticks <= self.pause_until
+
+    def reset(self):
+        self.ball.reset_position()
+        self.score.reset_score()
+
+        for player in self.players:
+            player.reset_position()
+        self._sync_players()
+
+    def request_reset(self):
+        """
+        Resets the match at the start of the next step, so the reset is
+        part of that step's input and can be recorded.
+        """
+        self.reset_requests += 1
+
+    def set_pause(self, t: float, reset_players: bool = True):
+        self.pause_until = self.clock.ticks + self.clock.to_ticks(t)
+
+        if reset_players:
+            for player in self.players:
+                player.reset_position()
+
+    @traced('Simulation.step')
+    def step(self, keys=NO_KEYS) -> Collision | None:
+        requests = self.reset_requests
+        reset = requests != self.resets_handled
+        self.resets_handled = requests
+        if self.recorder is not None:
+            self.recorder.record(keys, reset)
+        if reset:
+            self.reset()
+
+        self.clock.tick()
+        if self.interpolate:
+            self._save_previous()
+
+        # Handle forced pause. No entity should move
+        collision = None if self.paused else self._update(keys)
+        if self.state_recorder is not None:
+            self.state_recorder.record(self, collision)
+        return collision
+
+    def advance(self, real_dt: float, keys=NO_KEYS) -> int:
+        """
+        Runs as many fixed steps as real_dt seconds of (scaled) wall-clock
+        time are worth and returns how many ran.
+        """
+        steps = self.clock.advance(real_dt)
+        for _ in range(steps):
+            self.step(keys)
+        return steps
+
+    def expire_banners(self):
+        """
+        Hides the goal and set piece banners once they are past their
+        duration, which drawing them otherwise does. A simulation drawn
+        from snapshots only ever draws copies of them.
+        """
+        self.score.goal_text_elapsed()
+        self.overlay.elapsed()
+
+    def run(
+        self,
+        ticks: int,
+        controller: Callable[['Simulation'], KeyState] | None = None,
+    ):
+        for _ in range(ticks):
+            keys = controller(self) if controller else NO_KEYS
+            self.step(keys)
+
+    def _update(self, keys) -> Collision | None:
+        collision = self.ball.update(
+            keys,
+            self.collision_system,
+            self.score,
+            self.set_pause,
+            self.overlay,
+        )
+        for player in self.players:
+            player.update(*self.ball.position)
+        self._sync_players()
+
+        if collision is not None:
+            self.events[collision] += 1
+        # Teleports (kick-off, goals, set pieces) are not interpolated
+        if self.interpolate and collision not in {
+            Collision.NONE,
+            Collision.PLAYER,
+        }:
+            self._save_previous()
+        return collision
+
+    def _save_previous(self):
+        self.ball.save_previous()
+        for player in self.players:
+            player.save_previous()
+
+    def _sync_players(self):
+        for player in self.players:
+            self.collision_system.update_collidable(player)
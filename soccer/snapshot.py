@@ -0,0 +1,174 @@
+import copy
+import threading
+import time
+
+import numpy as np
+import pygame
+
+from soccer.players import PlayerSwarm
+from soccer.profiler import FrameProfiler
+from soccer.simulation import NO_KEYS, Simulation
+from soccer.tracing import span
+
+# PlayerSwarm updates these in place, so a shallow copy would share them
+SWARM_ARRAYS = ('positions', 'previous_positions', 'orientations')
+
+
+class Snapshot:
+    """
+    What the renderer needs of a simulation after a step: detached copies
+    of the ball, players, score and overlay, which the Game draws just
+    like the live ones, plus the clock at the time of the step. Entities
+    replace their positions rather than mutating them, so copying them is
+    a shallow copy of their attributes; swarm arrays are copied into
+    arrays the snapshot owns.
+    """
+
+    def __init__(self, simulation: Simulation):
+        self.ball = copy.copy(simulation.ball)
+        self.players = [copy.copy(p) for p in simulation.players]
+        self.score = copy.copy(simulation.score)
+        self.overlay = copy.copy(simulation.overlay)
+        self.swarm_arrays = [
+            {name: getattr(p, name).copy() for name in SWARM_ARRAYS}
+            for p in simulation.players
+            if isinstance(p, PlayerSwarm)
+        ]
+        self.time = 0.0
+        self.accumulator = 0.0
+        self.step = simulation.clock.step
+        self.time_scale = simulation.clock.time_scale
+        # perf_counter() when the snapshot was captured
+        self.published = 0.0
+        self.capture(simulation)
+
+    def capture(self, simulation: Simulation):
+        clock = simulation.clock
+        self.ball.__dict__.update(simulation.ball.__dict__)
+        swarms = iter(self.swarm_arrays)
+        for player, source in zip(self.players, simulation.players):
+            player.__dict__.update(source.__dict__)
+            if isinstance(source, PlayerSwarm):
+                for name, array in next(swarms).items():
+                    np.copyto(array, getattr(source, name))
+                    setattr(player, name, array)
+        self.score.__dict__.update(simulation.score.__dict__)
+        self.overlay.__dict__.update(simulation.overlay.__dict__)
+        # Banners animate on the render side, between steps
+        self.score.now = self.now
+        self.overlay.now = self.now
+        self.time = clock.time
+        self.accumulator = clock.accumulator
+        self.published = time.perf_counter()
+
+    def offset(self) -> float:
+        """
+        Simulation seconds since the captured step as of now, assuming the
+        clock kept running, but never more than one step.
+        """
+        elapsed = (time.perf_counter() - self.published) * self.time_scale
+        return min(self.accumulator + elapsed, self.step)
+
+    @property
+    def alpha(self) -> float:
+        return self.offset() / self.step
+
+    def now(self) -> float:
+        return self.time + self.offset()
+
+
+class SnapshotBuffer:
+    """
+    Triple buffer of snapshots between the simulation and the renderer.
+    The simulation captures into the back snapshot and swaps it with the
+    ready one; the renderer swaps the ready one into the front when a
+    newer one was published. Each side only reads or writes its own
+    snapshot, and the lock is held for nothing but the swaps, so neither
+    ever waits for the other to copy or draw.
+    """
+
+    def __init__(self, simulation: Simulation):
+        self.back = Snapshot(simulation)
+        self.ready = Snapshot(simulation)
+        self.front = Snapshot(simulation)
+        self.fresh = False
+        self.lock = threading.Lock()
+
+    def publish(self, simulation: Simulation):
+        self.back.capture(simulation)
+        with self.lock:
+            self.back, self.ready = self.ready, self.back
+            self.fresh = True
+
+    def acquire(self) -> Snapshot:
+        """
+        The latest published snapshot. It stays valid until the next call.
+        """
+        with self.lock:
+            if self.fresh:
+                self.front, self.ready = self.ready, self.front
+                self.fresh = False
+        return self.front
+
+
+class SimulationThread(threading.Thread):
+    """
+    Runs a simulation on its own thread at its tick rate, with the keys
+    the render thread last handed over, and publishes a snapshot after
+    every batch of steps. Input stays on the render thread, since SDL
+    events have to be read on the thread that made the window.
+    """
+
+    def __init__(self, simulation: Simulation):
+        super().__init__(name='simulation', daemon=True)
+        self.simulation = simulation
+        self.snapshots = SnapshotBuffer(simulation)
+        # Replaced, never mutated, by the render thread
+        self.keys: pygame.key.ScancodeWrapper = NO_KEYS
+        self.stopped = threading.Event()
+        self.error: BaseException | None = None
+        # Separate from the Game's, whose current section the GL counter
+        # reads on the render thread
+        self.profiler = FrameProfiler()
+        self.profiler.section('step')
+        self.profiler.instrument(
+            simulation.collision_system, 'check_collisions', 'collisions'
+        )
+
+    def run(self):
+        try:
+            self._loop()
+        except BaseException as e:
+            self.error = e
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def check(self):
+        """
+        Raises on the render thread whatever ended the simulation thread.
+        """
+        if self.error is not None:
+            raise RuntimeError('simulation thread failed') from self.error
+
+    def _loop(self):
+        simulation = self.simulation
+        clock = simulation.clock
+        last = time.perf_counter()
+        while not self.stopped.is_set():
+            now = time.perf_counter()
+            with span('simulation'), self.profiler.section('step'):
+                steps = simulation.advance(now - last, self.keys)
+            last = now
+            if steps:
+                simulation.expire_banners()
+                self.snapshots.publish(simulation)
+                self.profiler.end_frame()
+            # Sleeps until the accumulator is worth another step. A
+            # stopped clock never gets there, so it just polls every step
+            if clock.time_scale:
+                delay = (clock.step - clock.accumulator) / clock.time_scale
+            else:
+                delay = clock.step
+            self.stopped.wait(delay)
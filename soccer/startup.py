@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from soccer.tracing import span
+
+# Time from Game() to the first frame on screen the startup should fit in
+STARTUP_BUDGET = 0.5
+
+
+@dataclass
+class Stage:
+    name: str
+    thread: str
+    # Seconds since the pipeline started
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class StartupPipeline:
+    """
+    Runs the slow, GL-free parts of startup (decoding images)
+    on a thread pool while the main thread brings up the window and GL
+    context, and times every stage on both. GL calls stay on the main
+    thread: workers return decoded data and the main thread uploads it.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.origin = time.perf_counter()
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix='startup',
+        )
+        self.stages: list[Stage] = []
+        self.lock = threading.Lock()
+        self.first_frame: float | None = None
+
+    def stage(self, name: str) -> '_Stage':
+        """
+        Context manager timing a block of the main thread as a stage.
+        """
+        return _Stage(self, name)
+
+    def submit(self, name: str, func: Callable, *args) -> Future:
+        """
+        Runs func(*args) on the pool as a stage and returns its future.
+        """
+
+        def run():
+            with self.stage(name):
+                return func(*args)
+
+        return self.executor.submit(run)
+
+    def mark_first_frame(self):
+        if self.first_frame is None:
+            self.first_frame = self.elapsed()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+    def report(self) -> str:
+        with self.lock:
+            stages = sorted(self.stages, key=lambda s: s.start)
+        lines = ['stage                         thread      start    time ms']
+        for s in stages:
+            lines.append(
+                f'{s.name:<29} {s.thread:<9} '
+                f'{s.start * 1000:7.1f} {s.duration * 1000:9.1f}'
+            )
+        if self.first_frame is not None:
+            verdict = (
+                'within' if self.first_frame <= STARTUP_BUDGET else 'OVER'
+            )
+            lines.append(
+                f'first frame after {self.first_frame * 1000:.1f} ms, '
+                f'{verdict} the {STARTUP_BUDGET * 1000:.0f} ms budget'
+            )
+        return '\n'.join(lines)
+
+    def add(self, stage: Stage):
+        with self.lock:
+            self.stages.append(stage)
+
+
+class _Stage:
+    def __init__(self, pipeline: StartupPipeline, name: str):
+        self.pipeline = pipeline
+        self.name = name
+        self.span = span(f'startup.{name}')
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = self.pipeline.elapsed()
+        self.span.__enter__()
+
+    def __exit__(self, *exc):
+        self.span.__exit__(*exc)
+        thread = threading.current_thread()
+        self.pipeline.add(
+            Stage(
+                self.name,
+                'main'
+                if thread is threading.main_thread()
+                else thread.name.replace('startup_', 'pool-'),
+                self.start,
+                self.pipeline.elapsed(),
+            )
+        )
@@ -0,0 +1,103 @@
+import math
+
+from OpenGL.GL import (
+    GL_COMPILE,
+    GL_UNSIGNED_BYTE,
+    glCallList,
+    glCallLists,
+    glColor3f,
+    glEndList,
+    glGenLists,
+    glListBase,
+    glNewList,
+    glPopMatrix,
+    glPushMatrix,
+    glRasterPos2f,
+    glScalef,
+    glTranslatef,
+)
+from OpenGL.GLUT import (
+    GLUT_BITMAP_HELVETICA_18,
+    GLUT_STROKE_ROMAN,
+    glutBitmapCharacter,
+    glutStrokeCharacter,
+)
+
+N_GLYPHS = 256
+
+
+class GlyphCache:
+    """
+    Display lists for the 256 Latin-1 glyphs of a GLUT font, compiled the
+    first time the font is used. Bitmap glyphs keep the raster position
+    advance of glutBitmapCharacter, so a whole string is one glCallLists.
+    Outlined stroke glyphs bake in the 3x3 offset copies that fake the
+    outline, and leave the matrix untouched.
+    """
+
+    def __init__(self):
+        self.bitmap_bases = {}
+        self.outlined_bases = {}
+
+    def bitmap_base(self, font) -> int:
+        base = self.bitmap_bases.get(font.value)
+        if base is None:
+            base = self.bitmap_bases[font.value] = glGenLists(N_GLYPHS)
+            for c in range(N_GLYPHS):
+                glNewList(base + c, GL_COMPILE)
+                glutBitmapCharacter(font, c)
+                glEndList()
+        return base
+
+    def outlined_base(self, font) -> int:
+        base = self.outlined_bases.get(font.value)
+        if base is None:
+            base = self.outlined_bases[font.value] = glGenLists(N_GLYPHS)
+            for c in range(N_GLYPHS):
+                glNewList(base + c, GL_COMPILE)
+                for dx in [-1, 0, 1]:
+                    for dy in [-1, 0, 1]:
+                        glPushMatrix()
+                        glTranslatef(dx * 1, dy * 1, 0)
+                        glutStrokeCharacter(font, c)
+                        glPopMatrix()
+                glEndList()
+        return base
+
+
+glyph_cache = GlyphCache()
+
+
+def draw_bitmap_text(
+    x: float, y: float, text: str, font=GLUT_BITMAP_HELVETICA_18
+):
+    """
+    Draws `text` at raster position (x, y) with the current color.
+    """
+    glRasterPos2f(x, y)
+    glListBase(glyph_cache.bitmap_base(font))
+    glCallLists(len(text), GL_UNSIGNED_BYTE, text.encode('latin-1'))
+    glListBase(0)
+
+
+def draw_pulsing_text(text: str, elapsed: float, font=GLUT_STROKE_ROMAN):
+    """
+    Draws the big yellow outlined banner used for goals and set pieces.
+    Every character pulses in size, slightly behind the previous one.
+    """
+    base = glyph_cache.outlined_base(font)
+    glPushMatrix()
+    glTranslatef(-130, 0, 0)
+    glColor3f(1, 1, 0)
+
+    for i, c in enumerate(text.encode('latin-1')):
+        char_elapsed = elapsed - (i * 0.1)
+        scale = 1.0 + 0.3 * math.sin(char_elapsed * 5)
+
+        glPushMatrix()
+        glTranslatef(i * 40, 0, 0)
+        glScalef(scale * 0.6, scale * 0.6, 1)
+        glCallList(base + c)
+        glPopMatrix()
+
+    glPopMatrix()
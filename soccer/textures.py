@@ -0,0 +1,204 @@
+import os
+import struct
+from concurrent.futures import Future
+
+import numpy as np
+import pygame
+from OpenGL.GL import (
+    GL_LINEAR,
+    GL_LINEAR_MIPMAP_NEAREST,
+    GL_REPEAT,
+    GL_RGBA,
+    GL_TEXTURE_2D,
+    GL_TEXTURE_MAG_FILTER,
+    GL_TEXTURE_MAX_LEVEL,
+    GL_TEXTURE_MIN_FILTER,
+    GL_TEXTURE_WRAP_S,
+    GL_TEXTURE_WRAP_T,
+    GL_UNSIGNED_BYTE,
+    glBindTexture,
+    glGenTextures,
+    glTexImage2D,
+    glTexParameteri,
+)
+
+from soccer.assetcache import (
+    atomic_write,
+    entry_path,
+    remove_stale,
+    source_hash,
+)
+from soccer.startup import StartupPipeline
+
+CACHE_DIR = '.cache/textures'
+SUFFIX = '.tex'
+# Bumped whenever the file layout or the way levels are built changes,
+# so old cache files are never read back
+FORMAT_VERSION = 1
+# Magic, format version, number of levels
+HEADER = struct.Struct('<4sHH')
+MAGIC = b'CGTX'
+# Width, height and byte offset of one level
+LEVEL = struct.Struct('<IIQ')
+# Level data starts on a multiple of this
+ALIGNMENT = 64
+
+
+def decode(path: str) -> np.ndarray:
+    """
+    The image as an (h, w, 4) RGBA array, bottom row first like
+    pygame.image.tostring(surface, 'RGBA', True) gives it to glTexImage2D.
+    """
+    surface = pygame.image.load(path)
+    width, height = surface.get_size()
+    pixels = pygame.image.tostring(surface, 'RGBA', True)
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, 4)
+
+
+def build_mipmaps(image: np.ndarray) -> list[np.ndarray]:
+    """
+    The full mipmap chain of an RGBA image, down to 1x1. Each level is
+    the 2x2 box filter of the one before, which drops the last row or
+    column of odd sizes.
+    """
+    levels = [image]
+    while levels[-1].shape[0] > 1 or levels[-1].shape[1] > 1:
+        previous = levels[-1].astype(np.uint16)
+        height = max(1, previous.shape[0] // 2)
+        width = max(1, previous.shape[1] // 2)
+        # A side of 1 is averaged with itself
+        rows = [0, 1] if previous.shape[0] > 1 else [0, 0]
+        columns = [0, 1] if previous.shape[1] > 1 else [0, 0]
+        total = sum(
+            previous[r : r + 2 * height : 2, c : c + 2 * width : 2]
+            for r in rows
+            for c in columns
+        )
+        levels.append(((total + 2) // 4).astype(np.uint8))
+    return levels
+
+
+def write_levels(path: str, levels: list[np.ndarray]):
+    offset = HEADER.size + LEVEL.size * len(levels)
+    table = []
+    for level in levels:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        table.append((level.shape[1], level.shape[0], offset))
+        offset += level.nbytes
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(levels)))
+        for entry in table:
+            f.write(LEVEL.pack(*entry))
+        for level, (_, _, start) in zip(levels, table):
+            f.seek(start)
+            f.write(level.tobytes())
+
+
+def read_levels(path: str) -> list[np.ndarray]:
+    """
+    Maps a file written by write_levels. The levels are read-only views
+    of the mapping, so nothing is copied until they are uploaded.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, version, n_levels = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f'{path} is not a version {FORMAT_VERSION} cache')
+
+    levels = []
+    for i in range(n_levels):
+        width, height, offset = LEVEL.unpack_from(
+            data, HEADER.size + LEVEL.size * i
+        )
+        size = width * height * 4
+        levels.append(data[offset : offset + size].reshape(height, width, 4))
+    return levels
+
+
+class TextureCache:
+    """
+    Decoded, mipmapped RGBA textures stored in `directory` as files that
+    are memory-mapped and uploaded as is. Files are named after a hash of
+    the source image, so editing the image rebuilds its entry and
+    replaces the stale one. Uploaded textures are shared by path, so
+    every Ball draws with the same texture.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR):
+        self.directory = directory
+        self.textures: dict[str, int] = {}
+        # Levels being read or built on a startup worker
+        self.pending: dict[str, Future] = {}
+
+    def entry(self, path: str) -> str:
+        digest = source_hash(path, FORMAT_VERSION)
+        return entry_path(self.directory, path, digest, SUFFIX)
+
+    def levels(self, path: str) -> list[np.ndarray]:
+        entry = self.entry(path)
+        if os.path.exists(entry):
+            try:
+                return read_levels(entry)
+            except ValueError:
+                pass
+
+        levels = build_mipmaps(decode(path))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            remove_stale(self.directory, path, SUFFIX)
+            write_levels(entry, levels)
+        except OSError:
+            # A read-only checkout still runs, it just decodes every time
+            return levels
+        return read_levels(entry)
+
+    def prefetch(self, path: str, pipeline: StartupPipeline):
+        """
+        Starts reading (or building) the levels of `path` on the startup
+        pool; load() then only has to upload them.
+        """
+        if path not in self.textures and path not in self.pending:
+            self.pending[path] = pipeline.submit(
+                f'texture {os.path.basename(path)}', self.levels, path
+            )
+
+    def load(self, path: str) -> int:
+        """
+        The id of a mipmapped, repeating GL texture of the image at `path`
+        in the current context, uploaded on the first call.
+        """
+        texture = self.textures.get(path)
+        if texture is not None:
+            return texture
+
+        future = self.pending.pop(path, None)
+        levels = future.result() if future else self.levels(path)
+        texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        for i, level in enumerate(levels):
+            height, width = level.shape[:2]
+            glTexImage2D(
+                GL_TEXTURE_2D,
+                i,
+                GL_RGBA,
+                width,
+                height,
+                0,
+                GL_RGBA,
+                GL_UNSIGNED_BYTE,
+                level,
+            )
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+        # Bilinear within the nearest level: on llvmpipe it costs the same
+        # as plain GL_LINEAR did, where blending two levels costs ~20% more
+        glTexParameteri(
+            GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_NEAREST
+        )
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        self.textures[path] = texture
+        return texture
+
+
+texture_cache = TextureCache()
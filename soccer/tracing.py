@@ -0,0 +1,159 @@
+import atexit
+import functools
+import json
+import os
+import queue
+import threading
+import time
+
+
+class Tracer:
+    """
+    Collects spans as (name, start, end, thread) tuples and writes them to
+    `path` as Chrome trace-event JSON, which Perfetto and chrome://tracing
+    open directly. Recording a span is one list append; every
+    `flush_every` spans the buffer is handed to a writer thread, so memory
+    stays bounded on long runs without the encoding showing up in the
+    spans being traced. Nested spans on a thread show up as a call stack.
+    """
+
+    # The tracer span() and traced() record to, set by start()
+    active: 'Tracer | None' = None
+
+    def __init__(self, path: str, flush_every: int = 10_000):
+        self.path = path
+        self.flush_every = flush_every
+        # Only ever appended to and cut from the front, never replaced, so
+        # a span added while a batch is taken out stays in the buffer
+        self.events: list[tuple[str, int, int, int]] = []
+        self.pid = os.getpid()
+        self.file = open(path, 'w', encoding='utf-8')
+        self.file.write('[\n')
+        self.first = True
+        self.lock = threading.Lock()
+        # Batches of events to write, then None once the trace is closed
+        self.batches: queue.SimpleQueue = queue.SimpleQueue()
+        self.writer = threading.Thread(
+            target=self._write_batches, name='trace-writer', daemon=True
+        )
+        self.writer.start()
+
+    def add(self, name: str, start: int, end: int):
+        self.events.append((name, start, end, threading.get_native_id()))
+        if len(self.events) >= self.flush_every:
+            self.flush()
+
+    def span(self, name: str) -> '_Span':
+        return _Span(self, name)
+
+    def flush(self):
+        """
+        Hands the buffered events to the writer thread.
+        """
+        with self.lock:
+            n = len(self.events)
+            if not n:
+                return
+            events = self.events[:n]
+            del self.events[:n]
+        self.batches.put(events)
+
+    def close(self):
+        self.flush()
+        self.batches.put(None)
+        self.writer.join()
+        self.file.write('\n]\n')
+        self.file.close()
+
+    def _write_batches(self):
+        while (events := self.batches.get()) is not None:
+            lines = []
+            for name, start, end, tid in events:
+                event = {
+                    'name': name,
+                    'ph': 'X',
+                    'ts': start / 1000,
+                    'dur': (end - start) / 1000,
+                    'pid': self.pid,
+                    'tid': tid,
+                }
+                lines.append(json.dumps(event, separators=(',', ':')))
+            if not self.first:
+                self.file.write(',\n')
+            self.file.write(',\n'.join(lines))
+            self.first = False
+            self.file.flush()
+
+
+class _Span:
+    def __init__(self, tracer: Tracer, name: str):
+        self.tracer = tracer
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter_ns())
+
+
+class _NullSpan:
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def start(path: str, flush_every: int = 10_000) -> Tracer:
+    """
+    Starts tracing to `path`. The trace is closed on stop() or, at the
+    latest, when the interpreter exits.
+    """
+    stop()
+    Tracer.active = Tracer(path, flush_every)
+    atexit.register(stop)
+    return Tracer.active
+
+
+def stop():
+    tracer, Tracer.active = Tracer.active, None
+    if tracer is not None:
+        tracer.close()
+        atexit.unregister(stop)
+
+
+def span(name: str):
+    """
+    Context manager timing a block as span `name`. Does nothing unless
+    tracing was started.
+    """
+    tracer = Tracer.active
+    return _NULL_SPAN if tracer is None else _Span(tracer, name)
+
+
+def traced(name: str):
+    """
+    Decorator recording every call of the function as span `name` while
+    tracing is on. When it is off the only cost is one extra call.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = Tracer.active
+            if tracer is None:
+                return func(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.add(name, start_ns, time.perf_counter_ns())
+
+        return wrapper
+
+    return decorate